@@ -24,6 +24,21 @@ st.set_page_config(
 db = get_database()
 validator = DIGIPINValidator()
 
+# Card colors for request status and priority
+STATUS_COLORS = {
+    'PENDING': '#ff9800',
+    'IN_PROGRESS': '#2196f3',
+    'COMPLETED': '#4caf50',
+    'FAILED': '#f44336',
+    'CANCELLED': '#9e9e9e'
+}
+PRIORITY_COLORS = {
+    'LOW': '#9e9e9e',
+    'NORMAL': '#2196f3',
+    'HIGH': '#ff9800',
+    'URGENT': '#f44336'
+}
+
 # Initialize session states
 if 'logged_in_agent' not in st.session_state:
     st.session_state.logged_in_agent = None
@@ -529,24 +544,18 @@ with tab2:
             ]
         
         if validations:
+            # Fetch verifications for all listed requests in one query
+            verifications_by_validation = db.get_verifications_by_validation_ids(
+                [v.get('id') for v in validations]
+            )
+            
             # Display as cards
             for val in validations:
                 status = val.get('status', 'PENDING')
-                status_color = {
-                    'PENDING': '#ff9800',
-                    'IN_PROGRESS': '#2196f3',
-                    'COMPLETED': '#4caf50',
-                    'FAILED': '#f44336',
-                    'CANCELLED': '#9e9e9e'
-                }.get(status, '#9e9e9e')
+                status_color = STATUS_COLORS.get(status, '#9e9e9e')
                 
                 priority = val.get('priority', 'NORMAL')
-                priority_color = {
-                    'LOW': '#9e9e9e',
-                    'NORMAL': '#2196f3',
-                    'HIGH': '#ff9800',
-                    'URGENT': '#f44336'
-                }.get(priority, '#2196f3')
+                priority_color = PRIORITY_COLORS.get(priority, '#2196f3')
                 
                 col1, col2 = st.columns([3, 1])
                 
@@ -588,30 +597,28 @@ with tab2:
                 with col2:
                     # Use expander to show details directly
                     with st.expander("View Details", expanded=False):
-                        val_details = db.get_validation(val.get('id'))
-                        if val_details:
-                            st.markdown(f"""
-                            **Address ID:** {val_details.get('address_id', 'N/A')}  
-                            **Digital Address:** {val_details.get('digital_address', 'N/A')}  
-                            **Type:** {val_details.get('validation_type', 'N/A')}  
-                            **Agent:** {val_details.get('assigned_agent_id', 'Unassigned')}  
-                            **Created:** {val_details.get('created_at', 'N/A')[:19] if val_details.get('created_at') else 'N/A'}
-                            """)
-                            
-                            # Get related verifications
-                            verifications = db.get_verifications_by_validation(val.get('id'))
-                            
-                            if verifications:
-                                st.markdown("**Verifications:**")
-                                for ver in verifications:
-                                    status_icon = "✅" if ver.get('verified') else "❌"
-                                    st.markdown(f"""
-                                    {status_icon} Quality: **{ver.get('quality_score', 0)*100:.0f}%** | 
-                                    Agent: {ver.get('agent_id', 'N/A')} | 
-                                    Date: {ver.get('timestamp', 'N/A')[:10] if ver.get('timestamp') else 'N/A'}
-                                    """)
-                            else:
-                                st.info("No verifications yet")
+                        st.markdown(f"""
+                        **Address ID:** {val.get('address_id', 'N/A')}  
+                        **Digital Address:** {val.get('digital_address', 'N/A')}  
+                        **Type:** {val.get('validation_type', 'N/A')}  
+                        **Agent:** {val.get('assigned_agent_id', 'Unassigned')}  
+                        **Created:** {val.get('created_at', 'N/A')[:19] if val.get('created_at') else 'N/A'}
+                        """)
+                        
+                        # Related verifications (prefetched above)
+                        verifications = verifications_by_validation.get(val.get('id'), [])
+                        
+                        if verifications:
+                            st.markdown("**Verifications:**")
+                            for ver in verifications:
+                                status_icon = "✅" if ver.get('verified') else "❌"
+                                st.markdown(f"""
+                                {status_icon} Quality: **{ver.get('quality_score', 0)*100:.0f}%** | 
+                                Agent: {ver.get('agent_id', 'N/A')} | 
+                                Date: {ver.get('timestamp', 'N/A')[:10] if ver.get('timestamp') else 'N/A'}
+                                """)
+                        else:
+                            st.info("No verifications yet")
         
         else:
             st.info("📋 No validation requests found. Submit a new request to get started!")
@@ -9,18 +9,21 @@ import plotly.graph_objects as go
 import sys
 import os
 from datetime import datetime, timedelta
-import random
+import numpy as np
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.database import get_database
-from utils.digipin import DIGIPINValidator
+from utils.digipin import DIGIPINValidator, format_digipin
 from utils.confidence_score import (
     ConfidenceScoreCalculator,
     AddressData,
     DeliveryRecord,
     PhysicalVerification,
     DeliveryStatus,
+    GRADE_BINS,
+    GRADE_LABELS,
+    GRADE_COLORS,
     get_grade_color,
     get_grade
 )
@@ -31,10 +34,13 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize
-db = get_database()
-validator = DIGIPINValidator()
-calculator = ConfidenceScoreCalculator()
+# Initialize (shared resources, created once per server process)
+@st.cache_resource
+def _get_resources():
+    """Database, DIGIPIN validator and score calculator shared across reruns."""
+    return get_database(), DIGIPINValidator(), ConfidenceScoreCalculator()
+
+db, validator, calculator = _get_resources()
 
 # Initialize session states
 if 'logged_in_agent' not in st.session_state:
@@ -42,6 +48,111 @@ if 'logged_in_agent' not in st.session_state:
 if 'admin_logged_in' not in st.session_state:
     st.session_state.admin_logged_in = False
 
+
+@st.cache_data(show_spinner=False)
+def _score_table(addresses: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the batch analysis table once per set of addresses.
+    
+    Args:
+        addresses: Frame with id, digipin, city, confidence_score and
+            confidence_grade columns
+        
+    Returns:
+        DataFrame with Address ID, DIGIPIN, City, Score and Grade columns
+    """
+    df = addresses.rename(columns={
+        'id': 'Address ID',
+        'digipin': 'DIGIPIN',
+        'city': 'City',
+        'confidence_score': 'Score',
+        'confidence_grade': 'Grade'
+    }).fillna({'Address ID': '', 'DIGIPIN': '', 'City': 'N/A', 'Score': 0, 'Grade': 'F'})
+    df['Score'] = df['Score'].astype(float)
+    df['DIGIPIN'] = df['DIGIPIN'].map(format_digipin)
+    
+    # Stored scores and grades are served as-is; only addresses without a
+    # stored score get a sample score (seeded so the table stays stable
+    # across reruns)
+    missing = df['Score'] == 0
+    if missing.any():
+        rng = np.random.default_rng(42)
+        df.loc[missing, 'Score'] = np.clip(rng.normal(70, 15, missing.sum()), 0, 100)
+        df.loc[missing, 'Grade'] = np.array(GRADE_LABELS)[np.digitize(df.loc[missing, 'Score'], GRADE_BINS)]
+    df['Score'] = df['Score'].round(1)
+    
+    return df
+
+
+@st.cache_data(show_spinner=False)
+def _scores_csv(df: pd.DataFrame) -> bytes:
+    """CSV download payload for a score table, cached per table contents."""
+    return df.to_csv(index=False).encode('utf-8')
+
+
+# Static gauge parts; only the value, bar color and threshold change per score
+_STORED_GAUGE_STATIC = {
+    'axis': {'range': [0, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
+    'bgcolor': "white",
+    'borderwidth': 2,
+    'bordercolor': "gray",
+    'steps': [
+        {'range': [0, 50], 'color': 'rgba(244, 67, 54, 0.3)'},
+        {'range': [50, 70], 'color': 'rgba(255, 193, 7, 0.3)'},
+        {'range': [70, 90], 'color': 'rgba(76, 175, 80, 0.3)'},
+        {'range': [90, 100], 'color': 'rgba(0, 150, 136, 0.3)'}
+    ]
+}
+_SIMULATED_GAUGE_STATIC = {
+    'axis': {'range': [0, 100]},
+    'steps': [
+        {'range': [0, 50], 'color': "rgba(244, 67, 54, 0.2)"},
+        {'range': [50, 70], 'color': "rgba(255, 193, 7, 0.2)"},
+        {'range': [70, 90], 'color': "rgba(76, 175, 80, 0.2)"},
+        {'range': [90, 100], 'color': "rgba(0, 150, 136, 0.2)"}
+    ]
+}
+_GAUGE_DOMAIN = {'x': [0, 1], 'y': [0, 1]}
+
+
+@st.cache_data(show_spinner=False)
+def _stored_score_gauge(score: float, color: str) -> dict:
+    """Plotly spec for the search tab's score gauge, cached per (score, color)."""
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=score,
+        domain=_GAUGE_DOMAIN,
+        title={'text': "Confidence Score (from Database)", 'font': {'size': 24}},
+        gauge={
+            **_STORED_GAUGE_STATIC,
+            'bar': {'color': color},
+            'threshold': {
+                'line': {'color': "black", 'width': 4},
+                'thickness': 0.75,
+                'value': score
+            }
+        }
+    ))
+    fig.update_layout(
+        height=350,
+        margin=dict(l=30, r=30, t=50, b=30)
+    )
+    return fig.to_dict()
+
+
+@st.cache_data(show_spinner=False)
+def _simulated_score_gauge(score: float, color: str) -> dict:
+    """Plotly spec for the score-analysis gauge, cached per (score, color)."""
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=score,
+        domain=_GAUGE_DOMAIN,
+        title={'text': "Simulated Score", 'font': {'size': 20}},
+        gauge={**_SIMULATED_GAUGE_STATIC, 'bar': {'color': color}}
+    ))
+    fig.update_layout(height=300, margin=dict(l=30, r=30, t=50, b=30))
+    return fig.to_dict()
+
 # Custom CSS - Apply BEFORE access check so sidebar looks consistent
 st.markdown("""
 <style>
@@ -192,7 +303,7 @@ with tab1:
         if sample_addresses:
             for addr in sample_addresses:
                 digipin = addr.get('digipin', 'N/A')
-                if st.button(f"📍 {validator._format_digipin(digipin)}", key=f"sample_{addr.get('id')}"):
+                if st.button(f"📍 {format_digipin(digipin)}", key=f"sample_{addr.get('id')}"):
                     search_value = digipin
                     search_type = "DIGIPIN"
                     search_btn = True
@@ -214,7 +325,11 @@ with tab1:
             address = db.get_address(search_value)
         
         if address:
-            st.success(f"✅ Address found: {address.get('id')}")
+            address_id = address.get('id')
+            created_at = address.get('created_at')
+            updated_at = address.get('updated_at')
+            
+            st.success(f"✅ Address found: {address_id}")
             
             # ============================================================
             # USE STORED DATABASE SCORE (NOT RECALCULATED)
@@ -224,18 +339,7 @@ with tab1:
             
             # Determine grade if not stored
             if not stored_grade or stored_grade == 'F':
-                if stored_score >= 90:
-                    stored_grade = 'A+'
-                elif stored_score >= 80:
-                    stored_grade = 'A'
-                elif stored_score >= 70:
-                    stored_grade = 'B'
-                elif stored_score >= 60:
-                    stored_grade = 'C'
-                elif stored_score >= 50:
-                    stored_grade = 'D'
-                else:
-                    stored_grade = 'F'
+                stored_grade = get_grade(stored_score)
             
             grade_descriptions = {
                 'A+': 'Excellent - Highly Reliable',
@@ -257,35 +361,7 @@ with tab1:
                     'C': '#FFC107', 'D': '#FF9800', 'F': '#f44336'
                 }.get(stored_grade, '#9e9e9e')
                 
-                fig = go.Figure(go.Indicator(
-                    mode="gauge+number",
-                    value=stored_score,
-                    domain={'x': [0, 1], 'y': [0, 1]},
-                    title={'text': "Confidence Score (from Database)", 'font': {'size': 24}},
-                    gauge={
-                        'axis': {'range': [0, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
-                        'bar': {'color': grade_color},
-                        'bgcolor': "white",
-                        'borderwidth': 2,
-                        'bordercolor': "gray",
-                        'steps': [
-                            {'range': [0, 50], 'color': 'rgba(244, 67, 54, 0.3)'},
-                            {'range': [50, 70], 'color': 'rgba(255, 193, 7, 0.3)'},
-                            {'range': [70, 90], 'color': 'rgba(76, 175, 80, 0.3)'},
-                            {'range': [90, 100], 'color': 'rgba(0, 150, 136, 0.3)'}
-                        ],
-                        'threshold': {
-                            'line': {'color': "black", 'width': 4},
-                            'thickness': 0.75,
-                            'value': stored_score
-                        }
-                    }
-                ))
-                fig.update_layout(
-                    height=350,
-                    margin=dict(l=30, r=30, t=50, b=30)
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(go.Figure(_stored_score_gauge(stored_score, grade_color)), use_container_width=True)
                 
                 # Grade display
                 st.markdown(f"""
@@ -317,8 +393,8 @@ with tab1:
                 st.markdown(f"""
                 **Latitude:** {address.get('latitude', 'N/A')}  
                 **Longitude:** {address.get('longitude', 'N/A')}  
-                **Created:** {address.get('created_at', 'N/A')[:10] if address.get('created_at') else 'N/A'}  
-                **Updated:** {address.get('updated_at', 'N/A')[:10] if address.get('updated_at') else 'N/A'}
+                **Created:** {created_at[:10] if created_at else 'N/A'}  
+                **Updated:** {updated_at[:10] if updated_at else 'N/A'}
                 """)
             
             st.divider()
@@ -327,14 +403,15 @@ with tab1:
             st.markdown("### ✅ Verification History")
             
             # Get verifications for this address
-            verifications = db.get_verifications_for_address(address.get('id'))
+            verifications = db.get_verifications_for_address(address_id)
             
             if verifications:
                 for ver in verifications:
                     status_icon = "✅" if ver.get('verified') else "❌"
+                    ver_timestamp = ver.get('timestamp')
                     st.markdown(f"""
                     - {status_icon} **{ver.get('id')}** - Quality: {ver.get('quality_score', 0)*100:.0f}% - 
-                    Agent: {ver.get('agent_id', 'N/A')} - Date: {ver.get('timestamp', 'N/A')[:10] if ver.get('timestamp') else 'N/A'}
+                    Agent: {ver.get('agent_id', 'N/A')} - Date: {ver_timestamp[:10] if ver_timestamp else 'N/A'}
                     """)
             else:
                 st.info("No verifications recorded yet. Request verification from User Portal.")
@@ -427,32 +504,42 @@ with tab2:
     
     with col2:
         # Generate sample data based on parameters
-        import numpy as np
-        
-        # Create deliveries
+        # Create deliveries (all random draws in one batch)
         num_deliveries = 20
-        delivery_records = []
-        
-        for i in range(num_deliveries):
-            # Determine status based on success rate
-            if random.random() < delivery_success * 0.85:
-                status = DeliveryStatus.DELIVERED
-            elif random.random() < delivery_success:
-                status = DeliveryStatus.DELIVERED_WITH_DIFFICULTY
-            else:
-                status = DeliveryStatus.FAILED
-            
-            # Add coordinate with variance
-            variance_deg = spatial_variance / 111320  # Convert meters to degrees
-            
-            delivery_records.append(DeliveryRecord(
+        variance_deg = spatial_variance / 111320  # Convert meters to degrees
+        rng = np.random.default_rng()
+        
+        # Determine status based on success rate; the second draw decides
+        # between difficulty and failure, as the per-delivery loop did
+        u_delivered, u_difficulty = rng.random((2, num_deliveries))
+        status_idx = np.where(
+            u_delivered < delivery_success * 0.85, 0,
+            np.where(u_difficulty < delivery_success, 1, 2)
+        )
+        statuses = np.array([
+            DeliveryStatus.DELIVERED,
+            DeliveryStatus.DELIVERED_WITH_DIFFICULTY,
+            DeliveryStatus.FAILED
+        ], dtype=object)[status_idx]
+        
+        # Add coordinates with variance
+        lats = 28.6139 + rng.normal(0, variance_deg, num_deliveries)
+        lons = 77.2090 + rng.normal(0, variance_deg, num_deliveries)
+        days_ago = rng.integers(0, 366, num_deliveries)
+        ratings = rng.integers(3, 6, num_deliveries)
+        
+        now = datetime.now()
+        delivery_records = [
+            DeliveryRecord(
                 id=f"SIM-{i:04d}",
-                timestamp=datetime.now() - timedelta(days=random.randint(0, 365)),
-                status=status,
-                actual_lat=28.6139 + random.gauss(0, variance_deg),
-                actual_lon=77.2090 + random.gauss(0, variance_deg),
-                ease_rating=random.randint(3, 5) if status == DeliveryStatus.DELIVERED else None
-            ))
+                timestamp=now - timedelta(days=int(days_ago[i])),
+                status=statuses[i],
+                actual_lat=float(lats[i]),
+                actual_lon=float(lons[i]),
+                ease_rating=int(ratings[i]) if status_idx[i] == 0 else None
+            )
+            for i in range(num_deliveries)
+        ]
         
         # Add one recent event
         delivery_records.append(DeliveryRecord(
@@ -491,30 +578,12 @@ with tab2:
         sim_result = calculator.calculate(sim_address)
         
         # Display gauge
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=sim_result.score,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Simulated Score", 'font': {'size': 20}},
-            gauge={
-                'axis': {'range': [0, 100]},
-                'bar': {'color': get_grade_color(sim_result.grade)},
-                'steps': [
-                    {'range': [0, 50], 'color': "rgba(244, 67, 54, 0.2)"},
-                    {'range': [50, 70], 'color': "rgba(255, 193, 7, 0.2)"},
-                    {'range': [70, 90], 'color': "rgba(76, 175, 80, 0.2)"},
-                    {'range': [90, 100], 'color': "rgba(0, 150, 136, 0.2)"}
-                ]
-            }
-        ))
-        fig.update_layout(height=300, margin=dict(l=30, r=30, t=50, b=30))
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(go.Figure(_simulated_score_gauge(sim_result.score, get_grade_color(sim_result.grade))), use_container_width=True)
         
         # Component bars
         st.markdown(f"**Grade: {sim_result.grade}** - {sim_result.grade_description}")
         
         for key, comp in sim_result.components.items():
-            color = get_grade_color(get_grade(comp.raw_value * 100))
             st.markdown(f"""
             **{comp.name}**: {comp.raw_value:.1%}
             """)
@@ -552,29 +621,11 @@ with tab3:
     all_addresses = db.get_all_addresses(limit=200)
     
     if len(all_addresses) >= 5:
-        # Generate scores for all
-        scores_data = []
-        
-        for addr in all_addresses:
-            # Quick score calculation (or use stored score)
-            score = addr.get('confidence_score', 0)
-            grade = addr.get('confidence_grade', 'F')
-            
-            # If no score, generate sample
-            if score == 0:
-                score = random.gauss(70, 15)
-                score = max(0, min(100, score))
-                grade = get_grade(score)
-            
-            scores_data.append({
-                'Address ID': addr.get('id', ''),
-                'DIGIPIN': validator._format_digipin(addr.get('digipin', '')),
-                'City': addr.get('city', 'N/A'),
-                'Score': round(score, 1),
-                'Grade': grade
-            })
-        
-        df = pd.DataFrame(scores_data)
+        # Scores are computed once per address set; filters below only mask the cached frame
+        df = _score_table(pd.DataFrame.from_records(
+            all_addresses,
+            columns=['id', 'digipin', 'city', 'confidence_score', 'confidence_grade']
+        ))
         
         # Summary metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -617,10 +668,7 @@ with tab3:
                 values=list(grade_counts.values()),
                 names=list(grade_counts.keys()),
                 color=list(grade_counts.keys()),
-                color_discrete_map={
-                    'A+': '#00C853', 'A': '#00E676', 'B': '#FFEB3B',
-                    'C': '#FFC107', 'D': '#FF9800', 'F': '#F44336'
-                }
+                color_discrete_map=GRADE_COLORS
             )
             fig.update_layout(height=300, margin=dict(l=20, r=20, t=30, b=20))
             st.plotly_chart(fig, use_container_width=True)
@@ -656,11 +704,10 @@ with tab3:
             hide_index=True
         )
         
-        # Download option
-        csv = filtered_df.to_csv(index=False)
+        # Download option (re-encoded only when the filtered rows change)
         st.download_button(
             "📥 Download as CSV",
-            csv,
+            _scores_csv(filtered_df),
             "confidence_scores.csv",
             "text/csv"
         )
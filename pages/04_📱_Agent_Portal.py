@@ -25,6 +25,14 @@ st.set_page_config(
 db = get_database()
 validator = DIGIPINValidator()
 
+# Priority badges for task cards
+PRIORITY_BADGES = {
+    'LOW': '🟢 Low',
+    'NORMAL': '🔵 Normal',
+    'HIGH': '🟠 High',
+    'URGENT': '🔴 Urgent'
+}
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -222,10 +230,10 @@ def agent_dashboard():
         ]
         
         # Also get UNASSIGNED pending validations (available to claim)
-        all_validations = db.get_all_validations()
+        pending_validations = db.get_validations_by_status('PENDING')
         unassigned_tasks = [
-            v for v in all_validations 
-            if v.get('status') == 'PENDING' and not v.get('assigned_agent_id')
+            v for v in pending_validations 
+            if not v.get('assigned_agent_id')
         ]
         
         # Show unassigned tasks first (available to claim)
@@ -235,12 +243,7 @@ def agent_dashboard():
             
             for task in unassigned_tasks[:5]:  # Show max 5
                 priority = task.get('priority', 'NORMAL')
-                priority_badge = {
-                    'LOW': '🟢 Low',
-                    'NORMAL': '🔵 Normal', 
-                    'HIGH': '🟠 High',
-                    'URGENT': '🔴 Urgent'
-                }.get(priority, '🔵 Normal')
+                priority_badge = PRIORITY_BADGES.get(priority, '🔵 Normal')
                 
                 with st.container():
                     col_info, col_btn = st.columns([3, 1])
@@ -279,12 +282,7 @@ def agent_dashboard():
                     elif priority == 'HIGH':
                         card_class += ' high'
                     
-                    priority_badge = {
-                        'LOW': '🟢 Low',
-                        'NORMAL': '🔵 Normal',
-                        'HIGH': '🟠 High',
-                        'URGENT': '🔴 Urgent'
-                    }.get(priority, '🔵 Normal')
+                    priority_badge = PRIORITY_BADGES.get(priority, '🔵 Normal')
                     
                     st.markdown(f"""
                     <div class="{card_class}">
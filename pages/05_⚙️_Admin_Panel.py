@@ -3,41 +3,55 @@
 # System administration and management
 
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import sys
 import os
-from datetime import datetime, timedelta
-import random
+import io
+from datetime import date, timedelta
+from operator import itemgetter
 import json
 import string
+import secrets
+import hmac
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.message import EmailMessage
 
 # Setup path
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
+ENV_PATH = os.path.join(PROJECT_ROOT, '.env')
+
+# Read config from .env file
+ENV_KEYS = frozenset({'ADMIN_USERNAME', 'ADMIN_PASSWORD', 'EMAIL_SENDER', 'EMAIL_PASSWORD'})
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _parse_env(env_path, mtime_ns):
+    """Parse the ENV_KEYS settings of a .env file; cached across reruns per modification time."""
+    values = {}
+    with open(env_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            key, sep, value = line.partition('=')
+            if not sep:
+                continue
+            key = key.strip()
+            if key in ENV_KEYS:
+                values[key] = value.strip()
+    return values
+
+def _read_env():
+    """Current .env values; the file is only re-read after it changes."""
+    try:
+        mtime_ns = os.stat(ENV_PATH).st_mtime_ns
+    except OSError:
+        return {}
+    return _parse_env(ENV_PATH, mtime_ns)
 
-# Read admin config from .env file
 def get_admin_config():
-    """Read admin config directly from .env file."""
-    env_path = os.path.join(PROJECT_ROOT, '.env')
-    config = {
-        'admin_username': 'admin_raj',
-        'admin_password': 'admin_raj@'
+    """Read admin config from the .env file."""
+    env = _read_env()
+    return {
+        'admin_username': env.get('ADMIN_USERNAME', 'admin_raj'),
+        'admin_password': env.get('ADMIN_PASSWORD', 'admin_raj@')
     }
-    
-    if os.path.exists(env_path):
-        with open(env_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith('ADMIN_USERNAME='):
-                    config['admin_username'] = line.split('=', 1)[1].strip()
-                elif line.startswith('ADMIN_PASSWORD='):
-                    config['admin_password'] = line.split('=', 1)[1].strip()
-    return config
 
 # Load config once
 ADMIN_CONFIG = get_admin_config()
@@ -57,25 +71,106 @@ def get_email_config():
 
     # Fallback to .env file
     if not sender or not password:
-        env_path = os.path.join(PROJECT_ROOT, '.env')
-        if os.path.exists(env_path):
-            with open(env_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-                    if '=' in line:
-                        key, value = line.split('=', 1)
-                        key = key.strip()
-                        value = value.strip()
-                        if key == 'EMAIL_SENDER' and not sender:
-                            sender = value
-                        elif key == 'EMAIL_PASSWORD' and not password:
-                            password = value
+        env = _read_env()
+        sender = sender or env.get('EMAIL_SENDER')
+        password = password or env.get('EMAIL_PASSWORD')
 
     return {'sender': sender, 'password': password}
 
 
+class SMTPConnectionPool:
+    """
+    A single authenticated Gmail SMTP session, reused across sends.
+    
+    Kept in st.session_state so each admin session opens at most one
+    connection; it is health-checked with NOOP before use, reopened if
+    the server dropped it, and closed on logout.
+    """
+    
+    def __init__(self, sender, password, host='smtp.gmail.com', port=465):
+        self.sender = sender
+        self.password = password
+        self.host = host
+        self.port = port
+        self._server = None
+    
+    def _ensure(self):
+        """Return a live, logged-in connection, reconnecting if needed."""
+        if self._server is not None:
+            try:
+                self._server.noop()
+                return self._server
+            except (smtplib.SMTPException, OSError):
+                self.close()
+        
+        # Only keep the connection once login succeeds, so a failed login
+        # is not reused as a live but unauthenticated session
+        server = smtplib.SMTP_SSL(self.host, self.port)
+        try:
+            server.login(self.sender, self.password)
+        except BaseException:
+            try:
+                server.quit()
+            except Exception:
+                server.close()
+            raise
+        self._server = server
+        return server
+    
+    def send(self, message):
+        """Send an EmailMessage, retrying once on a dropped connection."""
+        try:
+            self._ensure().send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            self.close()
+            self._ensure().send_message(message)
+    
+    def close(self):
+        """Close the connection if one is open."""
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
+
+
+def get_smtp_pool(sender, password):
+    """Get this session's SMTP pool, replacing it if the credentials changed."""
+    pool = st.session_state.get('_smtp_pool')
+    if pool is None or (pool.sender, pool.password) != (sender, password):
+        if pool is not None:
+            pool.close()
+        pool = SMTPConnectionPool(sender, password)
+        st.session_state['_smtp_pool'] = pool
+    return pool
+
+
+def close_smtp_pool():
+    """Close and forget this session's SMTP pool."""
+    pool = st.session_state.pop('_smtp_pool', None)
+    if pool is not None:
+        pool.close()
+
+
+# Credentials email, filled in per agent
+CREDENTIALS_EMAIL_SUBJECT = '🎉 Welcome to AAVA - Your Agent Credentials'
+CREDENTIALS_EMAIL_TEMPLATE = string.Template("""
+<html>
+<body>
+<p>Hi $name,</p>
+<p>Your agent account has been created. Here are your credentials:</p>
+<ul>
+  <li><strong>Agent ID:</strong> $agent_id</li>
+  <li><strong>Password:</strong> $password</li>
+  <li><strong>Email:</strong> $email</li>
+</ul>
+<p>Please keep these credentials secure.</p>
+</body>
+</html>
+""")
+
+
 def send_agent_credentials_email(agent_email, agent_name, agent_id, password):
     """Send agent credentials via Gmail SMTP. Returns (success: bool, message:str)."""
     cfg = get_email_config()
@@ -86,62 +181,46 @@ def send_agent_credentials_email(agent_email, agent_name, agent_id, password):
         return False, 'Email not configured. Provide EMAIL_SENDER and EMAIL_PASSWORD in secrets or .env'
 
     try:
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = '🎉 Welcome to AAVA - Your Agent Credentials'
+        msg = EmailMessage()
+        msg['Subject'] = CREDENTIALS_EMAIL_SUBJECT
         msg['From'] = sender
         msg['To'] = agent_email
+        msg.set_content(
+            CREDENTIALS_EMAIL_TEMPLATE.substitute(
+                name=agent_name, agent_id=agent_id, password=password, email=agent_email
+            ),
+            subtype='html'
+        )
 
-        html = f"""
-        <html>
-        <body>
-        <p>Hi {agent_name},</p>
-        <p>Your agent account has been created. Here are your credentials:</p>
-        <ul>
-          <li><strong>Agent ID:</strong> {agent_id}</li>
-          <li><strong>Password:</strong> {password}</li>
-          <li><strong>Email:</strong> {agent_email}</li>
-        </ul>
-        <p>Please keep these credentials secure.</p>
-        </body>
-        </html>
-        """
-
-        msg.attach(MIMEText(html, 'html'))
-
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-            server.login(sender, sender_password)
-            server.sendmail(sender, agent_email, msg.as_string())
+        get_smtp_pool(sender, sender_password).send(msg)
 
         return True, 'Email sent successfully'
     except Exception as e:
         return False, str(e)
 
+# Password character classes; every generated password uses each at least once
+PASSWORD_CHAR_CLASSES = (
+    string.ascii_uppercase,
+    string.ascii_lowercase,
+    string.digits,
+    "@#$%&*!"
+)
+PASSWORD_ALPHABET = ''.join(PASSWORD_CHAR_CLASSES)
+
 def generate_strong_password(length=12):
-    """Generate a strong random password."""
-    # Include uppercase, lowercase, digits, and special characters
-    uppercase = string.ascii_uppercase
-    lowercase = string.ascii_lowercase
-    digits = string.digits
-    special = "@#$%&*!"
-    
-    # Ensure at least one of each type
-    password = [
-        random.choice(uppercase),
-        random.choice(lowercase),
-        random.choice(digits),
-        random.choice(special)
-    ]
-    
-    # Fill remaining with random mix
-    all_chars = uppercase + lowercase + digits + special
-    password.extend(random.choice(all_chars) for _ in range(length - 4))
+    """Generate a strong random password from a cryptographically secure source."""
+    # Ensure at least one of each type, then fill remaining with random mix
+    password = [secrets.choice(chars) for chars in PASSWORD_CHAR_CLASSES]
+    password.extend(
+        secrets.choice(PASSWORD_ALPHABET)
+        for _ in range(length - len(PASSWORD_CHAR_CLASSES))
+    )
     
     # Shuffle the password
-    random.shuffle(password)
+    secrets.SystemRandom().shuffle(password)
     return ''.join(password)
 
 from utils.database import get_database
-from utils.digipin import DIGIPINValidator
 from utils.confidence_score import get_grade
 
 st.set_page_config(
@@ -158,8 +237,9 @@ ADMIN_PASSWORD = ADMIN_CONFIG['admin_password']
 if 'admin_logged_in' not in st.session_state:
     st.session_state.admin_logged_in = False
 
-# Custom CSS for sidebar and login (load always)
-st.markdown("""
+# Custom CSS for sidebar, login and admin pages; one stylesheet, emitted once
+# per script run (page constants are rebuilt on every rerun)
+ADMIN_CSS = """
 <style>
     /* Sidebar - Wider to prevent text truncation */
     [data-testid="stSidebar"] { min-width: 280px !important; width: 280px !important; }
@@ -167,35 +247,70 @@ st.markdown("""
     [data-testid="stSidebarNav"] li { margin-bottom: 0.5rem; }
     [data-testid="stSidebarNav"] a { font-size: 1.05rem !important; padding: 0.6rem 1rem !important; white-space: nowrap !important; }
     [data-testid="stSidebarNav"] span { font-size: 1.05rem !important; overflow: visible !important; text-overflow: clip !important; }
+    
+    /* Login page */
+    .admin-login-header {
+        background: linear-gradient(135deg, #9C27B0 0%, #7B1FA2 100%);
+        padding: 1.5rem 2rem;
+        border-radius: 12px;
+        color: white;
+        margin-bottom: 2rem;
+    }
+    .login-footer {
+        text-align: center;
+        margin-top: 1.5rem;
+        padding-top: 1.5rem;
+        border-top: 1px solid #eee;
+    }
+    .login-footer p {
+        color: #888;
+        font-size: 0.85rem;
+        margin: 0.25rem 0;
+    }
+    
+    /* Admin pages */
+    .admin-header {
+        background: linear-gradient(135deg, #9C27B0 0%, #7B1FA2 100%);
+        padding: 1.5rem 2rem;
+        border-radius: 12px;
+        color: white;
+        margin-bottom: 2rem;
+    }
+    .stat-card {
+        background: white;
+        padding: 1.5rem;
+        border-radius: 12px;
+        box-shadow: 0 2px 8px rgba(0,0,0,0.08);
+        text-align: center;
+    }
+    .stat-value {
+        font-size: 2.5rem;
+        font-weight: 700;
+        color: #1e3a5f;
+    }
+    .stat-label {
+        font-size: 0.9rem;
+        color: #666;
+        margin-top: 0.5rem;
+    }
+    .stat-row {
+        display: flex;
+        gap: 1rem;
+    }
+    .stat-row > div {
+        flex: 1;
+    }
+    .health-card {
+        background: #e8f5e9;
+        padding: 1rem;
+        border-radius: 8px;
+    }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(ADMIN_CSS, unsafe_allow_html=True)
 
 # Admin Login Check
 if not st.session_state.admin_logged_in:
-    # Professional Login Page CSS
-    st.markdown("""
-    <style>
-        .admin-login-header {
-            background: linear-gradient(135deg, #9C27B0 0%, #7B1FA2 100%);
-            padding: 1.5rem 2rem;
-            border-radius: 12px;
-            color: white;
-            margin-bottom: 2rem;
-        }
-        .login-footer {
-            text-align: center;
-            margin-top: 1.5rem;
-            padding-top: 1.5rem;
-            border-top: 1px solid #eee;
-        }
-        .login-footer p {
-            color: #888;
-            font-size: 0.85rem;
-            margin: 0.25rem 0;
-        }
-    </style>
-    """, unsafe_allow_html=True)
-    
     # Purple header banner
     st.markdown("""
     <div class="admin-login-header">
@@ -217,7 +332,9 @@ if not st.session_state.admin_logged_in:
             login_btn = st.form_submit_button("🔓 Sign In", use_container_width=True)
             
             if login_btn:
-                if username == ADMIN_USERNAME and password == ADMIN_PASSWORD:
+                # Constant-time comparisons; '&' so both are always evaluated
+                if (hmac.compare_digest(username.encode(), ADMIN_USERNAME.encode())
+                        & hmac.compare_digest(password.encode(), ADMIN_PASSWORD.encode())):
                     st.session_state.admin_logged_in = True
                     st.success("✅ Login successful!")
                     st.rerun()
@@ -233,45 +350,169 @@ if not st.session_state.admin_logged_in:
     
     st.stop()
 
+# Dashboard-only dependencies, imported after the login gate so the
+# login page doesn't pay for pandas/plotly on a cold start
+import pandas as pd
+import plotly.graph_objects as go
+
 # Initialize
 db = get_database()
-validator = DIGIPINValidator()
 
-# Custom CSS
-st.markdown("""
-<style>
-    /* Sidebar Navigation */
-    [data-testid="stSidebarNav"] ul { padding-top: 1rem; }
-    [data-testid="stSidebarNav"] li { margin-bottom: 0.5rem; }
-    [data-testid="stSidebarNav"] a { font-size: 1.05rem !important; padding: 0.6rem 1rem !important; }
-    [data-testid="stSidebarNav"] span { font-size: 1.05rem !important; }
-    
-    .admin-header {
-        background: linear-gradient(135deg, #9C27B0 0%, #7B1FA2 100%);
-        padding: 1.5rem 2rem;
-        border-radius: 12px;
-        color: white;
-        margin-bottom: 2rem;
-    }
-    .stat-card {
-        background: white;
-        padding: 1.5rem;
-        border-radius: 12px;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-        text-align: center;
-    }
-    .stat-value {
-        font-size: 2.5rem;
-        font-weight: 700;
-        color: #1e3a5f;
-    }
-    .stat-label {
-        font-size: 0.9rem;
-        color: #666;
-        margin-top: 0.5rem;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Cached reads - the admin tabs re-read the same tables on every widget
+# interaction, so keep results briefly and clear them after every write
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_dashboard_stats():
+    return db.get_dashboard_stats()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_validation_stats():
+    return db.get_validation_stats()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_validations(limit: int, status=None, validation_type=None, priority=None):
+    return db.get_all_validations(
+        limit=limit,
+        status=status,
+        validation_type=validation_type,
+        priority=priority
+    )
+
+# Agent row fields shown in the Agent List, in table column order
+_agent_table_fields = itemgetter(
+    'id', 'name', 'email', 'phone', 'performance_score', 'active', 'password'
+)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_agents_frame():
+    """
+    All agents as the Agent List table, plus one lowercase search blob per row.
+    
+    The blob joins ID, name, email and phone so an "All" search is a single
+    substring check per agent.
+    """
+    agents_df = pd.DataFrame.from_records(
+        (
+            (
+                agent_id or '',
+                name or '',
+                email or '',
+                phone or '',
+                f"{(performance or 0) * 100:.0f}%",
+                '✅ Active' if active else '❌ Inactive',
+                password or '(Not Set)'
+            )
+            for agent_id, name, email, phone, performance, active, password
+            in map(_agent_table_fields, db.get_all_agents())
+        ),
+        columns=['ID', 'Name', 'Email', 'Phone', 'Performance', 'Status', 'Password']
+    )
+    search_blobs = (
+        agents_df['ID'] + '\n' + agents_df['Name'] + '\n'
+        + agents_df['Email'] + '\n' + agents_df['Phone']
+    ).str.lower()
+    return agents_df, search_blobs
+
+# Agent search option -> table column (phone matches are case-sensitive)
+AGENT_SEARCH_COLUMNS = {"Agent ID": 'ID', "Name": 'Name', "Email": 'Email', "Phone": 'Phone'}
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_agent_performance(limit: int):
+    return db.get_top_agent_performance(limit)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_audit_logs(resource_type, limit: int):
+    return db.get_audit_logs(resource_type=resource_type, limit=limit)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_audit_logs_csv(resource_type, limit: int) -> bytes:
+    """Gzipped CSV export of the audit logs for the given filter."""
+    # Gzip the CSV straight into a buffer; audit text compresses well
+    buffer = io.BytesIO()
+    pd.DataFrame(_cached_audit_logs(resource_type, limit)).to_csv(
+        buffer, index=False, compression='gzip'
+    )
+    return buffer.getvalue()
+
+def _clear_cached_reads():
+    """Invalidate cached admin reads after a write."""
+    for cached in (_cached_dashboard_stats, _cached_validation_stats,
+                   _cached_validations, _cached_agents_frame,
+                   _cached_agent_performance, _cached_audit_logs,
+                   _cached_audit_logs_csv):
+        cached.clear()
+
+def format_digipin_column(digipins):
+    """Vectorized format_digipin: XXX-XXX-XXXX, or the cleaned value if not 10 characters."""
+    clean = digipins.str.replace('-', '', regex=False).str.replace(' ', '', regex=False).str.strip().str.upper()
+    hyphenated = clean.str[0:3] + '-' + clean.str[3:6] + '-' + clean.str[6:10]
+    return hyphenated.where(clean.str.len() == 10, clean)
+
+# Chart specs - cached per data so unchanged stats skip figure construction
+_CHART_LAYOUT = dict(height=300, margin=dict(l=20, r=20, t=30, b=20))
+AGENT_CHART_LIMIT = 50
+
+@st.cache_data(show_spinner=False)
+def _status_pie_spec(status_items: tuple) -> dict:
+    """Plotly spec for the validation status pie, from (status, count) pairs."""
+    fig = go.Figure(go.Pie(
+        values=[count for _, count in status_items],
+        labels=[status for status, _ in status_items],
+        marker_colors=['#4CAF50', '#2196F3', '#FF9800', '#F44336', '#9E9E9E']
+    ))
+    fig.update_layout(**_CHART_LAYOUT)
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False)
+def _type_bar_spec(type_items: tuple) -> dict:
+    """Plotly spec for the validation type bar chart, from (type, count) pairs."""
+    fig = go.Figure(go.Bar(
+        x=[vtype for vtype, _ in type_items],
+        y=[count for _, count in type_items],
+        marker_color='#2196F3'
+    ))
+    fig.update_layout(**_CHART_LAYOUT)
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False)
+def _agent_performance_spec(perf_items: tuple) -> dict:
+    """Plotly spec for the agent performance chart, from (name, score) pairs."""
+    scores = [score for _, score in perf_items]
+    fig = go.Figure(go.Bar(
+        x=[name for name, _ in perf_items],
+        y=scores,
+        marker=dict(color=scores, colorscale='RdYlGn', showscale=True)
+    ))
+    fig.update_layout(**_CHART_LAYOUT)
+    return fig.to_dict()
+
+# Dashboard cards - each row is emitted as a single markdown element
+STAT_CARD = (
+    '<div class="stat-card">'
+    '<div class="stat-value">{value}</div>'
+    '<div class="stat-label">{label}</div>'
+    '</div>'
+)
+# Static health row; like any page-level constant it is rebuilt on each rerun
+SYSTEM_HEALTH_HTML = '<div class="stat-row">' + "".join(
+    '<div class="health-card">'
+    f'<h4 style="margin: 0; color: #2e7d32;">🟢 {service}</h4>'
+    f'<p style="margin: 0.5rem 0 0 0; color: #666;">{state}</p>'
+    '</div>'
+    for service, state in [
+        ("Database", "Connected & Healthy"),
+        ("DIGIPIN Service", "Operational"),
+        ("Scoring Engine", "Active"),
+    ]
+) + '</div>'
+
+# Audit log icon by action verb; actions are logged as "<resource>.<verb>"
+AUDIT_ACTION_ICONS = {
+    'created': '➕',
+    'updated': '✏️',
+    'deleted': '🗑️',
+    'submitted': '📤',
+    'generated': '🎲'
+}
 
 # Header with logout button
 col_header, col_logout = st.columns([5, 1])
@@ -286,8 +527,26 @@ with col_logout:
     st.markdown("<br>", unsafe_allow_html=True)
     if st.button("🚪 Logout", use_container_width=True, key="admin_logout"):
         st.session_state.admin_logged_in = False
+        close_smtp_pool()
         st.rerun()
 
+def _tab_opened(key: str, label: str) -> bool:
+    """
+    Whether a tab's heavy content should render.
+    
+    Streamlit runs every tab body on each rerun, visible or not, so the
+    non-default tabs wait for a first explicit open and stay open for the
+    rest of the session.
+    """
+    opened = st.session_state.setdefault('admin_tabs_opened', set())
+    if key in opened:
+        return True
+    if st.button(f"📂 Load {label}", key=f"open_tab_{key}"):
+        opened.add(key)
+        return True
+    st.caption(f"{label} are loaded on demand.")
+    return False
+
 # Tabs
 tab1, tab2, tab3, tab4 = st.tabs([
     "📊 Dashboard",
@@ -300,56 +559,29 @@ tab1, tab2, tab3, tab4 = st.tabs([
 # TAB 1: DASHBOARD
 # =============================================================================
 
-with tab1:
+@st.fragment
+def _render_dashboard():
+    """System dashboard; reruns on its own when its widgets change."""
     st.markdown("### 📊 System Dashboard")
     
     # Get stats
     try:
-        stats = db.get_dashboard_stats()
-        
-        # Top metrics
-        col1, col2, col3, col4, col5 = st.columns(5)
+        stats = _cached_dashboard_stats()
         
-        with col1:
-            st.markdown(f"""
-            <div class="stat-card">
-                <div class="stat-value">{stats.get('total_addresses', 0):,}</div>
-                <div class="stat-label">Total Addresses</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-            <div class="stat-card">
-                <div class="stat-value">{stats.get('total_validations', 0):,}</div>
-                <div class="stat-label">Total Validations</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown(f"""
-            <div class="stat-card">
-                <div class="stat-value">{stats.get('pending_validations', 0):,}</div>
-                <div class="stat-label">Pending</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col4:
-            st.markdown(f"""
-            <div class="stat-card">
-                <div class="stat-value">{stats.get('active_agents', 0):,}</div>
-                <div class="stat-label">Active Agents</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col5:
-            delivery_rate = stats.get('delivery_success_rate', 0)
-            st.markdown(f"""
-            <div class="stat-card">
-                <div class="stat-value">{delivery_rate:.1f}%</div>
-                <div class="stat-label">Delivery Success</div>
-            </div>
-            """, unsafe_allow_html=True)
+        # Top metrics, rendered as one flex row
+        stat_cards = [
+            (f"{stats.get('total_addresses', 0):,}", "Total Addresses"),
+            (f"{stats.get('total_validations', 0):,}", "Total Validations"),
+            (f"{stats.get('pending_validations', 0):,}", "Pending"),
+            (f"{stats.get('active_agents', 0):,}", "Active Agents"),
+            (f"{stats.get('delivery_success_rate', 0):.1f}%", "Delivery Success"),
+        ]
+        st.markdown(
+            '<div class="stat-row">'
+            + "".join(STAT_CARD.format(value=value, label=label) for value, label in stat_cards)
+            + '</div>',
+            unsafe_allow_html=True
+        )
         
         st.divider()
         
@@ -359,16 +591,11 @@ with tab1:
         with col1:
             st.markdown("#### Validation Status")
             
-            val_stats = db.get_validation_stats()
+            val_stats = _cached_validation_stats()
             status_data = val_stats.get('by_status', {})
             
             if status_data:
-                fig = px.pie(
-                    values=list(status_data.values()),
-                    names=list(status_data.keys()),
-                    color_discrete_sequence=['#4CAF50', '#2196F3', '#FF9800', '#F44336', '#9E9E9E']
-                )
-                fig.update_layout(height=300, margin=dict(l=20, r=20, t=30, b=20))
+                fig = go.Figure(_status_pie_spec(tuple(status_data.items())))
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.info("No validation data")
@@ -379,12 +606,7 @@ with tab1:
             type_data = val_stats.get('by_type', {})
             
             if type_data:
-                fig = px.bar(
-                    x=list(type_data.keys()),
-                    y=list(type_data.values()),
-                    color_discrete_sequence=['#2196F3']
-                )
-                fig.update_layout(height=300, margin=dict(l=20, r=20, t=30, b=20))
+                fig = go.Figure(_type_bar_spec(tuple(type_data.items())))
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.info("No validation data")
@@ -392,44 +614,28 @@ with tab1:
         # System health
         st.divider()
         st.markdown("#### 🔧 System Health")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown("""
-            <div style="background: #e8f5e9; padding: 1rem; border-radius: 8px;">
-                <h4 style="margin: 0; color: #2e7d32;">🟢 Database</h4>
-                <p style="margin: 0.5rem 0 0 0; color: #666;">Connected & Healthy</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown("""
-            <div style="background: #e8f5e9; padding: 1rem; border-radius: 8px;">
-                <h4 style="margin: 0; color: #2e7d32;">🟢 DIGIPIN Service</h4>
-                <p style="margin: 0.5rem 0 0 0; color: #666;">Operational</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown("""
-            <div style="background: #e8f5e9; padding: 1rem; border-radius: 8px;">
-                <h4 style="margin: 0; color: #2e7d32;">🟢 Scoring Engine</h4>
-                <p style="margin: 0.5rem 0 0 0; color: #666;">Active</p>
-            </div>
-            """, unsafe_allow_html=True)
+        st.markdown(SYSTEM_HEALTH_HTML, unsafe_allow_html=True)
     
     except Exception as e:
         st.error(f"Error loading dashboard: {str(e)}")
 
 
+with tab1:
+    _render_dashboard()
+
+
 # =============================================================================
 # TAB 2: VALIDATIONS MANAGEMENT
 # =============================================================================
 
-with tab2:
+@st.fragment
+def _render_validations():
+    """Validation list, filters and bulk status changes."""
     st.markdown("### 📋 Validation Management")
     
+    if not _tab_opened('validations', "Validations"):
+        return
+    
     # Filters
     col1, col2, col3, col4 = st.columns(4)
     
@@ -459,30 +665,33 @@ with tab2:
         refresh_btn = st.button("🔄 Refresh", key="refresh_val")
     
     # Get validations
-    validations = db.get_all_validations(limit=200)
-    
-    # Apply filters
-    if status_filter != "All":
-        validations = [v for v in validations if v.get('status') == status_filter]
-    if type_filter != "All":
-        validations = [v for v in validations if v.get('validation_type') == type_filter]
-    if priority_filter != "All":
-        validations = [v for v in validations if v.get('priority') == priority_filter]
+    if refresh_btn:
+        _clear_cached_reads()
+    validations = _cached_validations(
+        200,
+        status=status_filter if status_filter != "All" else None,
+        validation_type=type_filter if type_filter != "All" else None,
+        priority=priority_filter if priority_filter != "All" else None
+    )
     
     if validations:
         # Convert to DataFrame
-        df = pd.DataFrame([
-            {
-                'ID': v.get('id', ''),
-                'DIGIPIN': validator._format_digipin(v.get('digipin', '')),
-                'Type': v.get('validation_type', ''),
-                'Status': v.get('status', ''),
-                'Priority': v.get('priority', ''),
-                'Agent': v.get('assigned_agent_id', 'N/A'),
-                'Created': v.get('created_at', '')[:10] if v.get('created_at') else 'N/A'
-            }
-            for v in validations
-        ])
+        df = pd.DataFrame.from_records(
+            (
+                (
+                    v.get('id', ''),
+                    v.get('digipin') or '',
+                    v.get('validation_type', ''),
+                    v.get('status', ''),
+                    v.get('priority', ''),
+                    v.get('assigned_agent_id', 'N/A'),
+                    v.get('created_at', '')[:10] if v.get('created_at') else 'N/A'
+                )
+                for v in validations
+            ),
+            columns=['ID', 'DIGIPIN', 'Type', 'Status', 'Priority', 'Agent', 'Created']
+        )
+        df['DIGIPIN'] = format_digipin_column(df['DIGIPIN'])
         
         st.dataframe(df, use_container_width=True, hide_index=True)
         
@@ -508,9 +717,9 @@ with tab2:
             st.markdown("<br>", unsafe_allow_html=True)
             if st.button("Apply Status Change"):
                 if selected_ids:
-                    for vid in selected_ids:
-                        db.update_validation(vid, {'status': new_status})
-                    st.success(f"✅ Updated {len(selected_ids)} validations")
+                    updated = db.bulk_update_validation_status(selected_ids, new_status)
+                    _clear_cached_reads()
+                    st.success(f"✅ Updated {updated} validations")
                     st.rerun()
                 else:
                     st.warning("Select validations first")
@@ -518,13 +727,22 @@ with tab2:
         st.info("📋 No validations found. Create new validations via the Validation Request page.")
 
 
+with tab2:
+    _render_validations()
+
+
 # =============================================================================
 # TAB 3: AGENT MANAGEMENT
 # =============================================================================
 
-with tab3:
+@st.fragment
+def _render_agents():
+    """Agent search, management and performance overview."""
     st.markdown("### 👥 Agent Management")
     
+    if not _tab_opened('agents', "Agents"):
+        return
+    
     # Search Section
     st.markdown("#### 🔍 Search Agent")
     search_col1, search_col2 = st.columns([3, 1])
@@ -544,87 +762,99 @@ with tab3:
         )
     
     # Get all agents
-    agents = db.get_all_agents()
-    
-    # Filter agents based on search
-    filtered_agents = agents
-    if search_query and agents:
-        search_lower = search_query.lower()
-        search_upper = search_query.upper()
-        if search_type == "Agent ID":
-            filtered_agents = [a for a in agents if search_upper in a.get('id', '').upper()]
-        elif search_type == "Name":
-            filtered_agents = [a for a in agents if search_lower in a.get('name', '').lower()]
-        elif search_type == "Email":
-            filtered_agents = [a for a in agents if search_lower in a.get('email', '').lower()]
-        elif search_type == "Phone":
-            filtered_agents = [a for a in agents if search_query in a.get('phone', '')]
-        else:  # All
-            filtered_agents = [
-                a for a in agents 
-                if search_lower in a.get('name', '').lower() 
-                or search_lower in a.get('email', '').lower() 
-                or search_query in a.get('phone', '')
-                or search_upper in a.get('id', '').upper()
-            ]
+    agents_df, search_blobs = _cached_agents_frame()
+    
+    # Filter agents based on search, one vectorized match over the chosen field
+    filtered_df = agents_df
+    if search_query and not agents_df.empty:
+        if search_type == "All":
+            mask = search_blobs.str.contains(search_query.lower(), regex=False)
+        else:
+            column = AGENT_SEARCH_COLUMNS[search_type]
+            mask = agents_df[column].str.contains(
+                search_query, case=column != 'Phone', regex=False
+            )
+        filtered_df = agents_df[mask].reset_index(drop=True)
     
     st.divider()
     
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        st.markdown(f"#### Agent List ({len(filtered_agents)} found)")
+        st.markdown(f"#### Agent List ({len(filtered_df)} found)")
         
-        if filtered_agents:
-            for agent in filtered_agents:
-                agent_id = agent.get('id', '')
-                agent_name = agent.get('name', 'Unknown')
-                agent_password = agent.get('password', '') or '(Not Set)'
+        if not filtered_df.empty:
+            # One table for every agent; only the Password column is editable
+            edited_df = st.data_editor(
+                filtered_df,
+                use_container_width=True,
+                hide_index=True,
+                disabled=[c for c in filtered_df.columns if c != 'Password'],
+                key="agents_editor"
+            )
+            
+            changed = edited_df['Password'].ne(filtered_df['Password'])
+            if changed.any():
+                password_updates = edited_df.loc[changed, ['ID', 'Password']].fillna('')
+                if st.button(f"💾 Save {len(password_updates)} password change(s)", key="save_agent_passwords"):
+                    if password_updates['Password'].str.len().lt(4).any():
+                        st.error("Min 4 characters!")
+                    else:
+                        for agent_id, new_pwd in password_updates.itertuples(index=False):
+                            db.update_agent(agent_id, {'password': new_pwd})
+                        _clear_cached_reads()
+                        st.success("Passwords saved!")
+                        st.rerun()
+            
+            # Actions render once, for the agent picked here
+            agent_index = st.selectbox(
+                "Manage agent",
+                options=range(len(filtered_df)),
+                format_func=lambda i: f"{filtered_df.at[i, 'Name'] or 'Unknown'} ({filtered_df.at[i, 'ID']})",
+                index=None,
+                placeholder="Select an agent to set a password or delete",
+                key="manage_agent"
+            )
+            
+            if agent_index is not None and agent_index < len(filtered_df):
+                agent = filtered_df.iloc[agent_index]
+                agent_id = agent['ID']
+                agent_name = agent['Name'] or 'Unknown'
                 
-                with st.container():
-                    col_info, col_actions = st.columns([3, 1])
-                    
-                    with col_info:
-                        st.markdown(f"**{agent_name}**")
-                        st.caption(f"🆔 `{agent_id}` | 📧 {agent.get('email', 'N/A')} | 📱 {agent.get('phone', 'N/A')}")
-                        perf = agent.get('performance_score', 0) * 100
-                        status = '✅ Active' if agent.get('active') else '❌ Inactive'
-                        st.caption(f"📊 {perf:.0f}% | {status} | 🔑 Password: `{agent_password}`")
-                    
-                    with col_actions:
-                        col_pwd, col_del = st.columns(2)
-                        
-                        with col_pwd:
-                            with st.popover("🔑"):
-                                st.markdown(f"**Set Password for {agent_name}**")
-                                new_pwd = st.text_input("New Password", type="password", key=f"pwd_{agent_id}")
-                                confirm_pwd = st.text_input("Confirm Password", type="password", key=f"cpwd_{agent_id}")
-                                if st.button("✅ Save", key=f"save_pwd_{agent_id}"):
-                                    if new_pwd and confirm_pwd:
-                                        if new_pwd == confirm_pwd:
-                                            if len(new_pwd) >= 4:
-                                                db.update_agent(agent_id, {'password': new_pwd})
-                                                st.success("Password saved!")
-                                                st.rerun()
-                                            else:
-                                                st.error("Min 4 characters!")
-                                        else:
-                                            st.error("Passwords don't match!")
-                                    else:
-                                        st.warning("Enter password")
-                        
-                        with col_del:
-                            with st.popover("🗑️"):
-                                st.warning(f"Delete **{agent_name}**?")
-                                st.caption("This action cannot be undone.")
-                                if st.button("✅ Yes, Delete", key=f"del_{agent_id}", type="primary"):
-                                    if db.delete_agent(agent_id):
-                                        st.success("Agent deleted!")
+                st.markdown(f"**Selected:** {agent_name} (`{agent_id}`)")
+                col_pwd, col_del = st.columns(2)
+                
+                with col_pwd:
+                    with st.popover("🔑 Set Password", use_container_width=True):
+                        st.markdown(f"**Set Password for {agent_name}**")
+                        new_pwd = st.text_input("New Password", type="password", key=f"pwd_{agent_id}")
+                        confirm_pwd = st.text_input("Confirm Password", type="password", key=f"cpwd_{agent_id}")
+                        if st.button("✅ Save", key=f"save_pwd_{agent_id}"):
+                            if new_pwd and confirm_pwd:
+                                if new_pwd == confirm_pwd:
+                                    if len(new_pwd) >= 4:
+                                        db.update_agent(agent_id, {'password': new_pwd})
+                                        _clear_cached_reads()
+                                        st.success("Password saved!")
                                         st.rerun()
                                     else:
-                                        st.error("Failed to delete")
-                    
-                    st.divider()
+                                        st.error("Min 4 characters!")
+                                else:
+                                    st.error("Passwords don't match!")
+                            else:
+                                st.warning("Enter password")
+                
+                with col_del:
+                    with st.popover("🗑️ Delete Agent", use_container_width=True):
+                        st.warning(f"Delete **{agent_name}**?")
+                        st.caption("This action cannot be undone.")
+                        if st.button("✅ Yes, Delete", key=f"del_{agent_id}", type="primary"):
+                            if db.delete_agent(agent_id):
+                                _clear_cached_reads()
+                                st.success("Agent deleted!")
+                                st.rerun()
+                            else:
+                                st.error("Failed to delete")
         elif search_query:
             st.warning(f"No agents found matching '{search_query}'")
         else:
@@ -639,14 +869,18 @@ with tab3:
             phone = st.text_input("Phone")
             send_credentials = st.checkbox("Send credentials via email to the agent", value=False, help="If checked, the agent will receive their Agent ID and password by email (requires EMAIL_SENDER and EMAIL_PASSWORD configured)")
             
+            # Defaults fixed per session; a default that changes between reruns
+            # gives the date widgets a new identity and drops the admin's input
+            default_cert_date, default_cert_expiry = st.session_state.setdefault(
+                'agent_cert_defaults',
+                (date.today(), date.today() + timedelta(days=365))
+            )
+            
             col_a, col_b = st.columns(2)
             with col_a:
-                cert_date = st.date_input("Certification Date")
+                cert_date = st.date_input("Certification Date", value=default_cert_date)
             with col_b:
-                cert_expiry = st.date_input(
-                    "Expiry Date",
-                    value=datetime.now() + timedelta(days=365)
-                )
+                cert_expiry = st.date_input("Expiry Date", value=default_cert_expiry)
             
             if st.form_submit_button("➕ Add Agent", use_container_width=True):
                 if name and email:
@@ -664,6 +898,7 @@ with tab3:
                             'active': 1,
                             'performance_score': 0.8
                         })
+                        _clear_cached_reads()
                         st.success(f"✅ Agent created!")
                         st.info(f"🆔 Agent ID: `{agent_id}`")
                         st.info(f"🔑 Password: `{auto_password}`")
@@ -684,36 +919,36 @@ with tab3:
                     st.warning("Name and Email are required")
     
     # Agent performance overview
-    if agents:
+    if not agents_df.empty:
         st.divider()
-        st.markdown("#### Agent Performance")
-        
-        perf_data = [
-            {
-                'Agent': a.get('name', ''),
-                'Score': a.get('performance_score', 0) * 100
-            }
-            for a in agents
-        ]
+        st.markdown(f"#### Agent Performance (Top {AGENT_CHART_LIMIT})")
         
-        fig = px.bar(
-            pd.DataFrame(perf_data),
-            x='Agent',
-            y='Score',
-            color='Score',
-            color_continuous_scale='RdYlGn'
+        # Ranked and limited in SQL so the chart never grows past the limit
+        perf_items = tuple(
+            (name, score * 100)
+            for name, score in _cached_agent_performance(AGENT_CHART_LIMIT)
         )
-        fig.update_layout(height=300, margin=dict(l=20, r=20, t=30, b=20))
+        
+        fig = go.Figure(_agent_performance_spec(perf_items))
         st.plotly_chart(fig, use_container_width=True)
 
 
+with tab3:
+    _render_agents()
+
+
 # =============================================================================
 # TAB 4: AUDIT LOGS
 # =============================================================================
 
-with tab4:
+@st.fragment
+def _render_audit_logs():
+    """Audit trail with filters and CSV export."""
     st.markdown("### 📝 Audit Logs")
     
+    if not _tab_opened('audit_logs', "Audit Logs"):
+        return
+    
     st.markdown("View system audit trail for all operations.")
     
     # Filters
@@ -735,60 +970,46 @@ with tab4:
         limit = st.slider("Show last N entries", 10, 200, 50)
     
     # Get logs
-    logs = db.get_audit_logs(
-        resource_type=resource_filter if resource_filter != "All" else None,
-        limit=limit
-    )
+    resource_type = resource_filter if resource_filter != "All" else None
+    logs = _cached_audit_logs(resource_type, limit)
     
     if logs:
-        for log in logs:
-            action_icon = {
-                'created': '➕',
-                'updated': '✏️',
-                'deleted': '🗑️',
-                'submitted': '📤',
-                'generated': '🎲'
-            }
-            
-            action = log.get('action', '')
-            icon = '📝'
-            for key, val in action_icon.items():
-                if key in action:
-                    icon = val
-                    break
-            
-            st.markdown(f"""
-            <div style="background: white; padding: 0.75rem 1rem; border-radius: 8px; 
-                        margin-bottom: 0.5rem; box-shadow: 0 1px 3px rgba(0,0,0,0.08);
-                        border-left: 3px solid #9c27b0;">
-                <div style="display: flex; justify-content: space-between; align-items: center;">
-                    <div>
-                        <span style="font-size: 1.2rem;">{icon}</span>
-                        <strong style="margin-left: 0.5rem;">{action}</strong>
-                    </div>
-                    <span style="color: #666; font-size: 0.8rem;">{log.get('timestamp', '')}</span>
-                </div>
-                <div style="margin-top: 0.5rem; font-size: 0.85rem; color: #666;">
-                    <span>Actor: {log.get('actor', 'N/A')}</span>
-                    <span style="margin-left: 1rem;">Resource: {log.get('resource_type', '')}/{log.get('resource_id', '')}</span>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+        logs_df = pd.DataFrame(logs)
+        
+        # Icon per entry from the action's verb ("validation.created" -> "created")
+        actions = logs_df['action'].fillna('')
+        icons = actions.str.rpartition('.')[2].map(AUDIT_ACTION_ICONS).fillna('📝')
+        
+        st.dataframe(
+            logs_df[['timestamp', 'action', 'actor', 'resource_type', 'resource_id']]
+            .assign(action=icons + ' ' + actions)
+            .rename(columns={
+                'timestamp': 'Timestamp',
+                'action': 'Action',
+                'actor': 'Actor',
+                'resource_type': 'Resource Type',
+                'resource_id': 'Resource ID'
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
         
         # Export option
         st.divider()
         
-        df = pd.DataFrame(logs)
-        csv = df.to_csv(index=False)
         st.download_button(
             "📥 Download Audit Logs",
-            csv,
-            "audit_logs.csv",
-            "text/csv"
+            _cached_audit_logs_csv(resource_type, limit),
+            "audit_logs.csv.gz",
+            "application/gzip"
         )
     else:
         st.info("📝 No audit logs found.")
 
+
+with tab4:
+    _render_audit_logs()
+
 # Footer
 st.markdown("""
 ---
@@ -11,6 +11,7 @@ from datetime import datetime, timedelta
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.database import DatabaseManager
+from utils.digipin import format_digipin
 
 st.set_page_config(
     page_title="AIP Registry - AAVA",
@@ -173,24 +174,24 @@ with tab1:
     st.markdown(f"**Showing {len(filtered_addresses)} addresses**")
     
     if filtered_addresses:
-        # Convert to DataFrame for display
-        df_data = []
-        for addr in filtered_addresses:
-            digipin = addr.get('digipin', 'N/A')
-            formatted_digipin = f"{digipin[:3]}-{digipin[3:6]}-{digipin[6:]}" if len(digipin or '') == 10 else digipin
-            df_data.append({
-                'ID': addr.get('id', ''),
-                'DIGIPIN': formatted_digipin,
-                'Digital Address': addr.get('digital_address', 'N/A'),
-                'City': addr.get('city', 'N/A'),
-                'State': addr.get('state', 'N/A'),
-                'PIN': addr.get('pincode', 'N/A'),
-                'Score': f"{addr.get('confidence_score', 0):.0f}%",
-                'Grade': addr.get('confidence_grade', 'F'),
-                'Created': addr.get('created_at', '')[:10] if addr.get('created_at') else 'N/A'
-            })
-        
-        df = pd.DataFrame(df_data)
+        # Convert to DataFrame for display (rows streamed as tuples)
+        df = pd.DataFrame.from_records(
+            (
+                (
+                    addr.get('id', ''),
+                    format_digipin(addr.get('digipin') or 'N/A'),
+                    addr.get('digital_address', 'N/A'),
+                    addr.get('city', 'N/A'),
+                    addr.get('state', 'N/A'),
+                    addr.get('pincode', 'N/A'),
+                    f"{addr.get('confidence_score', 0):.0f}%",
+                    addr.get('confidence_grade', 'F'),
+                    addr.get('created_at', '')[:10] if addr.get('created_at') else 'N/A'
+                )
+                for addr in filtered_addresses
+            ),
+            columns=['ID', 'DIGIPIN', 'Digital Address', 'City', 'State', 'PIN', 'Score', 'Grade', 'Created']
+        )
         
         # Color-code the grade column
         def highlight_grade(val):
@@ -239,20 +240,20 @@ with tab2:
         
         st.markdown("---")
         
-        # Validation table
-        val_data = []
-        for val in all_validations[:50]:  # Show latest 50
-            val_data.append({
-                'Validation ID': val.get('id', ''),
-                'DIGIPIN': val.get('digipin', 'N/A'),
-                'Type': val.get('validation_type', 'N/A'),
-                'Status': val.get('status', 'N/A'),
-                'Priority': val.get('priority', 'NORMAL'),
-                'Agent': val.get('assigned_agent_id', 'Unassigned') or 'Unassigned',
-                'Created': val.get('created_at', '')[:10] if val.get('created_at') else 'N/A'
-            })
-        
-        df_val = pd.DataFrame(val_data)
+        # Validation table (rows already arrive newest-first, so build columns directly)
+        recent = pd.DataFrame.from_records(
+            all_validations[:50],  # Show latest 50
+            columns=['id', 'digipin', 'validation_type', 'status', 'priority', 'assigned_agent_id', 'created_at']
+        )
+        df_val = pd.DataFrame({
+            'Validation ID': recent['id'].fillna(''),
+            'DIGIPIN': recent['digipin'].fillna('N/A'),
+            'Type': recent['validation_type'].fillna('N/A'),
+            'Status': recent['status'].fillna('N/A'),
+            'Priority': recent['priority'].fillna('NORMAL'),
+            'Agent': recent['assigned_agent_id'].fillna('').replace('', 'Unassigned'),
+            'Created': recent['created_at'].str[:10].fillna('N/A')
+        })
         
         def highlight_status(val):
             colors = {
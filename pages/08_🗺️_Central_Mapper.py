@@ -24,6 +24,37 @@ db = DatabaseManager()
 db.initialize()
 digipin_validator = DIGIPINValidator()
 
+# Encoding and decoding are pure, so repeat lookups come from the cache
+@st.cache_data(max_entries=1024, show_spinner=False)
+def decode_digipin_cached(digipin):
+    """Decode a DIGIPIN to its cell."""
+    return digipin_validator.decode(digipin)
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def encode_digipin_cached(latitude, longitude):
+    """Encode coordinates to a DIGIPIN."""
+    return digipin_validator.encode(latitude, longitude)
+
+@st.cache_data(ttl=86400, max_entries=1024, show_spinner=False)
+def reverse_geocode_cached(latitude, longitude):
+    """Look up the place name of a DIGIPIN cell centre via Nominatim.
+
+    Failures raise instead of returning, so they are not cached.
+    """
+    import requests
+    response = requests.get(
+        "https://nominatim.openstreetmap.org/reverse",
+        params={
+            'lat': latitude,
+            'lon': longitude,
+            'format': 'json'
+        },
+        headers={'User-Agent': 'AAVA-CentralMapper/1.0'},
+        timeout=5
+    )
+    response.raise_for_status()
+    return response.json().get('display_name', 'Unknown')
+
 # CSS
 st.markdown("""
 <style>
@@ -115,7 +146,7 @@ with tab1:
         clean_digipin = digipin_input.replace('-', '').replace(' ', '').upper()
         
         if digipin_validator.validate(clean_digipin):
-            result = digipin_validator.decode(clean_digipin)
+            result = decode_digipin_cached(clean_digipin)
             
             if result.valid:
                 st.success("✅ Valid DIGIPIN")
@@ -171,21 +202,8 @@ with tab1:
                     
                     # Get place name
                     try:
-                        import requests
-                        response = requests.get(
-                            f"https://nominatim.openstreetmap.org/reverse",
-                            params={
-                                'lat': result.center_lat,
-                                'lon': result.center_lon,
-                                'format': 'json'
-                            },
-                            headers={'User-Agent': 'AAVA-CentralMapper/1.0'},
-                            timeout=5
-                        )
-                        if response.status_code == 200:
-                            place_data = response.json()
-                            place_name = place_data.get('display_name', 'Unknown')
-                            st.markdown(f"**📍 Location:** {place_name}")
+                        place_name = reverse_geocode_cached(result.center_lat, result.center_lon)
+                        st.markdown(f"**📍 Location:** {place_name}")
                     except:
                         pass
             else:
@@ -227,7 +245,7 @@ with tab2:
         encode_btn = st.button("📍 Generate DIGIPIN", use_container_width=True, type="primary")
     
     if encode_btn:
-        result = digipin_validator.encode(lat_input, lon_input)
+        result = encode_digipin_cached(lat_input, lon_input)
         
         if result.valid:
             formatted = f"{result.digipin[:3]}-{result.digipin[3:6]}-{result.digipin[6:]}"
@@ -6,14 +6,36 @@ import streamlit as st
 import sys
 import os
 import json
+import time
+import queue
+import threading
 from datetime import datetime, timedelta
 import re
+import base64
+import heapq
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+# Use orjson for the chat memory files when it is installed
+try:
+    import orjson
+
+    def dump_json(obj, indent=True):
+        """Serialize obj to UTF-8 JSON bytes."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    load_json = orjson.loads
+except ImportError:
+    def dump_json(obj, indent=True):
+        """Serialize obj to UTF-8 JSON bytes."""
+        return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+    load_json = json.loads
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #                    PERSISTENT MEMORY SYSTEM
@@ -21,186 +43,519 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Chat expiry time in hours
 CHAT_EXPIRY_HOURS = 48
-
-MEMORY_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "chat_memory.json")
-LEARNED_QA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "learned_qa.json")
-CHATS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "all_chats.json")
-ASSISTANT_AVATAR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "download.jpeg")
-USER_AVATAR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "baby.png")
+# Minimum time between removals of expired chats from disk
+CHAT_VACUUM_SECONDS = 3600
+# Number of chats listed under "Recent Chats"
+RECENT_CHATS_SHOWN = 10
+
+DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+MEMORY_FILE = os.path.join(DATA_DIR, "chat_memory.json")
+LEARNED_QA_FILE = os.path.join(DATA_DIR, "learned_qa.jsonl")
+LEARNED_QA_LEGACY_FILE = os.path.join(DATA_DIR, "learned_qa.json")
+CHATS_FILE = os.path.join(DATA_DIR, "all_chats.json")
+CHATS_DIR = os.path.join(DATA_DIR, "chats")
+CHATS_INDEX_FILE = os.path.join(CHATS_DIR, "index.json")
+ASSISTANT_AVATAR = os.path.join(PROJECT_ROOT, "assets", "download.jpeg")
+USER_AVATAR = os.path.join(PROJECT_ROOT, "assets", "baby.png")
+# Avatars passed to st.chat_message; None falls back to the default icon
+ASSISTANT_AVATAR_ICON = ASSISTANT_AVATAR if os.path.exists(ASSISTANT_AVATAR) else None
+USER_AVATAR_ICON = USER_AVATAR if os.path.exists(USER_AVATAR) else None
 
 def ensure_data_dir():
     """Ensure data directory exists."""
-    data_dir = os.path.dirname(MEMORY_FILE)
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
+    os.makedirs(DATA_DIR, exist_ok=True)
+
+# Parsed file contents are kept per session as {path: ((mtime_ns, size), data)}
+# so reruns reuse them until the file changes on disk
+FILE_CACHE_KEY = '_memory_file_cache'
+
+# learned_qa.jsonl keeps the last LEARNED_QA_LIMIT entries; it is trimmed
+# back to that once appends grow it past LEARNED_QA_COMPACT_BYTES
+LEARNED_QA_LIMIT = 200
+LEARNED_QA_COMPACT_BYTES = 1024 * 1024
+
+# chat_memory.json keeps the last HISTORY_MAX_MESSAGES messages of the open
+# chat and is rewritten at most every N messages or N seconds
+HISTORY_MAX_MESSAGES = 100
+HISTORY_FLUSH_MESSAGES = 4
+HISTORY_FLUSH_SECONDS = 30
+
+def file_version(path):
+    """Identify the on-disk version of a file, or None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def read_cached(path, parse, default):
+    """Return parse(path), reusing this session's copy while the file is unchanged."""
+    version = file_version(path)
+    if version is None:
+        return default
+    cache = st.session_state.setdefault(FILE_CACHE_KEY, {})
+    cached = cache.get(path)
+    if cached and cached[0] == version:
+        return cached[1]
+    data = parse(path)
+    cache[path] = (version, data)
+    return data
+
+def cache_written(path, data):
+    """Record data just written to path so the next read skips the disk."""
+    version = file_version(path)
+    if version is not None:
+        st.session_state.setdefault(FILE_CACHE_KEY, {})[path] = (version, data)
+
+def write_atomic(path, data):
+    """Write bytes to path via a temporary file and os.replace.
+
+    Readers see either the old or the new file, never a truncated one.
+    """
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+@st.cache_resource
+def get_background_writer():
+    """Start the one thread that performs queued chat memory writes.
+
+    Jobs are callables run in order. They must not touch st.session_state,
+    which is only available on the script thread.
+    """
+    jobs = queue.Queue()
+
+    def run():
+        while True:
+            job = jobs.get()
+            try:
+                job()
+            except (OSError, ValueError, TypeError) as e:
+                report_memory_error("background write", e)
+
+    threading.Thread(target=run, name="chat-memory-writer", daemon=True).start()
+    return jobs
+
+def report_memory_error(path, error):
+    """Log a chat memory IO failure to stderr."""
+    print(f"[chat memory] {path}: {error!r}", file=sys.stderr)
+
+def quarantine_file(path, error):
+    """Move an unparsable file aside so later loads do not keep failing on it."""
+    report_memory_error(path, error)
+    try:
+        os.replace(path, f"{path}.corrupt.{int(time.time())}")
+    except OSError as e:
+        report_memory_error(path, e)
+
+def load_memory_file(path, parse, default):
+    """Read a chat memory file through the session cache.
+
+    A missing or unreadable file gives default; a corrupt one is also
+    quarantined.
+    """
+    try:
+        return read_cached(path, parse, default)
+    except ValueError as e:
+        quarantine_file(path, e)
+    except OSError as e:
+        report_memory_error(path, e)
+    return default
+
+def read_json(path):
+    """Parse a JSON file."""
+    with open(path, 'rb') as f:
+        return load_json(f.read())
+
+def parse_jsonl_lines(path, lines):
+    """Parse JSONL lines, skipping blank ones and reporting undecodable ones.
+
+    A torn last line from an interrupted append is skipped instead of making
+    the whole log unreadable.
+    """
+    records = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            records.append(load_json(line))
+        except ValueError as e:
+            report_memory_error(path, e)
+    return records
+
+def read_jsonl(path):
+    """Parse a JSONL file into a list."""
+    with open(path, 'rb') as f:
+        return parse_jsonl_lines(path, f)
+
+def tail_jsonl(path, n, block_size=65536):
+    """Parse only the last n lines of a JSONL file, reading it from the end."""
+    with open(path, 'rb') as f:
+        end = f.seek(0, os.SEEK_END)
+        data = b""
+        # Read backwards until the buffer holds n complete lines
+        while end > 0 and data.count(b"\n") <= n:
+            start = max(0, end - block_size)
+            f.seek(start)
+            data = f.read(end - start) + data
+            end = start
+    lines = data.split(b"\n")
+    if end > 0:
+        lines = lines[1:]  # Partial line cut by the read window
+    return parse_jsonl_lines(path, lines)[-n:]
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #                    MULTIPLE CHATS MANAGEMENT (WITH 48HR AUTO-DELETE)
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def is_chat_expired(chat_data):
-    """Check if a chat has expired (older than 48 hours)."""
+def expiry_for(created_at):
+    """Unix time at which a chat created at the given ISO time expires."""
+    created_time = datetime.fromisoformat(created_at)
+    return int((created_time + timedelta(hours=CHAT_EXPIRY_HOURS)).timestamp())
+
+def chat_expiry(chat_data):
+    """Unix expiry time of a chat, or None if it cannot be determined.
+
+    Saved chats carry a precomputed expiry_unix; older entries fall back
+    to parsing their creation time.
+    """
+    expiry = chat_data.get('expiry_unix')
+    if expiry is not None:
+        return expiry
     try:
         created_at = chat_data.get('created_at', chat_data.get('updated_at', ''))
         if created_at:
-            created_time = datetime.fromisoformat(created_at)
-            expiry_time = created_time + timedelta(hours=CHAT_EXPIRY_HOURS)
-            return datetime.now() > expiry_time
-    except:
+            return expiry_for(created_at)
+    except ValueError:
         pass
-    return False
+    return None
+
+def is_chat_expired(chat_data):
+    """Check if a chat has expired (older than 48 hours)."""
+    expiry = chat_expiry(chat_data)
+    return expiry is not None and time.time() > expiry
 
 def get_time_remaining(chat_data):
     """Get time remaining before chat expires."""
-    try:
-        created_at = chat_data.get('created_at', chat_data.get('updated_at', ''))
-        if created_at:
-            created_time = datetime.fromisoformat(created_at)
-            expiry_time = created_time + timedelta(hours=CHAT_EXPIRY_HOURS)
-            remaining = expiry_time - datetime.now()
-            if remaining.total_seconds() > 0:
-                hours = int(remaining.total_seconds() // 3600)
-                minutes = int((remaining.total_seconds() % 3600) // 60)
-                return f"{hours}h {minutes}m"
-    except:
-        pass
+    expiry = chat_expiry(chat_data)
+    if expiry is not None:
+        remaining = int(expiry - time.time())
+        if remaining > 0:
+            hours, seconds = divmod(remaining, 3600)
+            return f"{hours}h {seconds // 60}m"
     return "Expired"
 
 def cleanup_expired_chats(chats):
     """Remove expired chats from the dictionary."""
-    cleaned = {}
-    for chat_id, chat_data in chats.items():
-        if not is_chat_expired(chat_data):
-            cleaned[chat_id] = chat_data
-    return cleaned
+    return {
+        chat_id: chat_data
+        for chat_id, chat_data in chats.items()
+        if not is_chat_expired(chat_data)
+    }
 
-def load_all_chats():
-    """Load all saved chats and remove expired ones."""
+def chat_messages_path(chat_id):
+    """Path of the append-only message log for a chat."""
+    return os.path.join(CHATS_DIR, f"{chat_id}.jsonl")
+
+def load_chat_index():
+    """Load chat metadata (name, timestamps, saved message count)."""
+    return load_memory_file(CHATS_INDEX_FILE, read_json, {})
+
+def save_chat_index(index):
+    """Save chat metadata. Messages live in the per-chat JSONL files."""
     try:
-        if os.path.exists(CHATS_FILE):
-            with open(CHATS_FILE, 'r', encoding='utf-8') as f:
-                chats = json.load(f)
-                # Clean up expired chats
-                cleaned_chats = cleanup_expired_chats(chats)
-                # Save cleaned chats if any were removed
-                if len(cleaned_chats) < len(chats):
-                    save_all_chats(cleaned_chats)
-                return cleaned_chats
-    except:
-        pass
-    return {}
+        os.makedirs(CHATS_DIR, exist_ok=True)
+        write_atomic(CHATS_INDEX_FILE, dump_json(index))
+        cache_written(CHATS_INDEX_FILE, index)
+    except OSError as e:
+        report_memory_error(CHATS_INDEX_FILE, e)
+
+def load_chat_messages(chat_id):
+    """Read a chat's messages back from its JSONL log."""
+    return load_memory_file(chat_messages_path(chat_id), read_jsonl, [])
+
+def write_chat_messages(chat_id, messages, replace=False):
+    """Append messages to a chat's JSONL log, or replace the log with them."""
+    try:
+        os.makedirs(CHATS_DIR, exist_ok=True)
+        lines = b"".join(dump_json(msg, indent=False) + b'\n' for msg in messages)
+        if replace:
+            write_atomic(chat_messages_path(chat_id), lines)
+        else:
+            with open(chat_messages_path(chat_id), 'ab') as f:
+                f.write(lines)
+    except OSError as e:
+        report_memory_error(chat_messages_path(chat_id), e)
+
+def remove_chat_files(chat_ids):
+    """Delete the JSONL logs of the given chats."""
+    for chat_id in chat_ids:
+        try:
+            os.remove(chat_messages_path(chat_id))
+        except OSError:
+            pass
 
-def save_all_chats(chats):
-    """Save all chats to file."""
+def migrate_legacy_chats():
+    """Split the old monolithic all_chats.json into per-chat JSONL files (runs once)."""
+    if not os.path.exists(CHATS_FILE) or os.path.exists(CHATS_INDEX_FILE):
+        return
     try:
-        ensure_data_dir()
-        with open(CHATS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(chats, f, indent=2, ensure_ascii=False)
-    except:
-        pass
+        chats = read_json(CHATS_FILE)
+    except ValueError as e:
+        quarantine_file(CHATS_FILE, e)
+        return
+    except OSError as e:
+        report_memory_error(CHATS_FILE, e)
+        return
+    try:
+        index = {}
+        for chat_id, chat_data in chats.items():
+            messages = chat_data.get('messages', [])
+            write_chat_messages(chat_id, messages, replace=True)
+            index[chat_id] = {
+                "name": chat_data.get('name', 'Unnamed Chat'),
+                "created_at": chat_data.get('created_at', chat_data.get('updated_at', '')),
+                "updated_at": chat_data.get('updated_at', ''),
+                "expiry_unix": chat_expiry(chat_data),
+                "message_count": len(messages)
+            }
+        save_chat_index(index)
+        os.replace(CHATS_FILE, CHATS_FILE + ".migrated")
+    except (OSError, AttributeError) as e:
+        report_memory_error(CHATS_FILE, e)
+
+def vacuum_expired_chats(index, cleaned_index):
+    """Drop expired chats from disk, at most once per CHAT_VACUUM_SECONDS."""
+    now = time.time()
+    if now - st.session_state.get('_chats_vacuumed_at', 0.0) < CHAT_VACUUM_SECONDS:
+        return
+    st.session_state['_chats_vacuumed_at'] = now
+    remove_chat_files(set(index) - set(cleaned_index))
+    save_chat_index(cleaned_index)
+
+def load_all_chats():
+    """Load metadata of all saved chats and remove expired ones.
+
+    Only the index is read; a chat's messages are loaded with
+    load_chat_messages when it is opened.
+    """
+    migrate_legacy_chats()
+    index = load_chat_index()
+    # Clean up expired chats
+    cleaned_index = cleanup_expired_chats(index)
+    # Expired chats are only hidden here; deleting them from disk is left to
+    # an occasional vacuum instead of rewriting the index on every read
+    if len(cleaned_index) < len(index):
+        vacuum_expired_chats(index, cleaned_index)
+    return cleaned_index
+
+def chat_updated_at(item):
+    """Sort key for (chat_id, metadata) pairs: last update time."""
+    return item[1].get('updated_at', '')
 
 def save_current_chat(chat_id, chat_name, messages):
-    """Save current chat to all chats."""
-    chats = load_all_chats()
+    """Save current chat, appending only the messages not yet on disk.
+
+    A chat whose messages and name are already saved is left untouched, so
+    switching chats does not rewrite the index or bump updated_at.
+    """
+    index = load_chat_index()
+    meta = index.get(chat_id, {})
+    saved_count = meta.get('message_count', 0)
+    if meta and saved_count == len(messages) and meta.get('name') == chat_name:
+        return
+    index = dict(index)
+    if saved_count <= len(messages):
+        write_chat_messages(chat_id, messages[saved_count:])
+    else:
+        # History shrank (e.g. was replaced): rewrite the log from scratch
+        write_chat_messages(chat_id, messages, replace=True)
     # Preserve created_at if chat exists, otherwise set it now
-    existing_created_at = chats.get(chat_id, {}).get('created_at', datetime.now().isoformat())
-    chats[chat_id] = {
+    created_at = meta.get('created_at', datetime.now().isoformat())
+    index[chat_id] = {
         "name": chat_name,
-        "messages": messages,
-        "created_at": existing_created_at,
-        "updated_at": datetime.now().isoformat()
+        "created_at": created_at,
+        "updated_at": datetime.now().isoformat(),
+        "expiry_unix": chat_expiry(meta) if meta else expiry_for(created_at),
+        "message_count": len(messages)
     }
-    save_all_chats(chats)
+    save_chat_index(index)
+
+def rename_chat(chat_id, new_name):
+    """Rename a saved chat."""
+    index = dict(load_chat_index())
+    if chat_id in index:
+        index[chat_id] = {**index[chat_id], "name": new_name}
+        save_chat_index(index)
 
 def delete_chat(chat_id):
-    """Delete a chat by ID."""
-    chats = load_all_chats()
-    if chat_id in chats:
-        del chats[chat_id]
-        save_all_chats(chats)
+    """Delete a chat by ID.
+
+    Expired chats are dropped in the same index write, which counts as this
+    session's vacuum.
+    """
+    index = load_chat_index()
+    kept = cleanup_expired_chats(index)
+    kept.pop(chat_id, None)
+    if len(kept) < len(index):
+        save_chat_index(kept)
+        st.session_state['_chats_vacuumed_at'] = time.time()
+    remove_chat_files((set(index) - set(kept)) | {chat_id})
 
 def generate_chat_id():
     """Generate unique chat ID."""
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
-def save_chat_history(messages):
-    """Save chat history to file."""
+def save_chat_history(messages, force=False):
+    """Save chat history to file.
+
+    Writes are debounced: unless forced, the file is only rewritten once
+    enough new messages or enough time have accumulated since the last write.
+    """
+    flushed_count, flushed_at = st.session_state.get('_history_flushed', (0, 0.0))
+    if (not force
+            and abs(len(messages) - flushed_count) < HISTORY_FLUSH_MESSAGES
+            and time.monotonic() - flushed_at < HISTORY_FLUSH_SECONDS):
+        return
     try:
         ensure_data_dir()
-        # Keep last 100 messages to avoid file bloat
-        recent = messages[-100:] if len(messages) > 100 else messages
-        with open(MEMORY_FILE, 'w', encoding='utf-8') as f:
-            json.dump({
-                "last_updated": datetime.now().isoformat(),
-                "messages": recent
-            }, f, indent=2, ensure_ascii=False)
-    except Exception as e:
-        pass  # Silently fail
+        # Keep the most recent messages to avoid file bloat
+        recent = messages[-HISTORY_MAX_MESSAGES:]
+        data = {
+            "last_updated": datetime.now().isoformat(),
+            "messages": recent
+        }
+        payload = dump_json(data)
+        get_background_writer().put(lambda: write_atomic(MEMORY_FILE, payload))
+        st.session_state['_history_flushed'] = (len(messages), time.monotonic())
+    except OSError as e:
+        report_memory_error(MEMORY_FILE, e)
 
 def load_chat_history():
     """Load chat history from file."""
-    try:
-        if os.path.exists(MEMORY_FILE):
-            with open(MEMORY_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get("messages", [])
-    except:
-        pass
-    return []
+    data = load_memory_file(MEMORY_FILE, read_json, {})
+    return list(data.get("messages", []))
 
-def save_learned_qa(question, answer):
-    """Save a Q&A pair to learned database."""
+def migrate_legacy_learned_qa():
+    """Convert the old learned_qa.json array into learned_qa.jsonl (runs once)."""
+    if not os.path.exists(LEARNED_QA_LEGACY_FILE) or os.path.exists(LEARNED_QA_FILE):
+        return
+    try:
+        learned = read_json(LEARNED_QA_LEGACY_FILE)
+    except ValueError as e:
+        quarantine_file(LEARNED_QA_LEGACY_FILE, e)
+        return
+    except OSError as e:
+        report_memory_error(LEARNED_QA_LEGACY_FILE, e)
+        return
+    try:
+        write_atomic(LEARNED_QA_FILE, b"".join(dump_json(qa, indent=False) + b'\n' for qa in learned))
+        os.replace(LEARNED_QA_LEGACY_FILE, LEARNED_QA_LEGACY_FILE + ".migrated")
+    except OSError as e:
+        report_memory_error(LEARNED_QA_LEGACY_FILE, e)
+
+def append_learned_qa(entry):
+    """Append one Q&A entry to learned_qa.jsonl (runs on the background writer).
+
+    Returns the file version after the write.
+    """
+    with open(LEARNED_QA_FILE, 'ab') as f:
+        f.write(dump_json(entry, indent=False) + b'\n')
+        size = f.tell()
+    
+    # Keep last LEARNED_QA_LIMIT learned Q&As, compacting once the log has grown
+    if size > LEARNED_QA_COMPACT_BYTES:
+        recent = tail_jsonl(LEARNED_QA_FILE, LEARNED_QA_LIMIT)
+        write_atomic(LEARNED_QA_FILE, b"".join(dump_json(qa, indent=False) + b'\n' for qa in recent))
+    return file_version(LEARNED_QA_FILE)
+
+def save_learned_qa(question, answer, chat_session=None):
+    """Save a Q&A pair to learned database.
+
+    The entry is appended on the background writer, so the reply is shown
+    without waiting on disk. If chat_session is given, its learned_version
+    is moved to the version this write produced, so the session's own
+    writes do not make its Gemini chat stale.
+    """
     try:
         ensure_data_dir()
-        learned = load_learned_qa()
-        
         # Add new Q&A with timestamp
-        learned.append({
+        entry = {
             "question": question,
             "answer": answer,
             "learned_at": datetime.now().isoformat()
-        })
-        
-        # Keep last 200 learned Q&As
-        if len(learned) > 200:
-            learned = learned[-200:]
-        
-        with open(LEARNED_QA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(learned, f, indent=2, ensure_ascii=False)
-    except:
-        pass
+        }
+        def job():
+            version = append_learned_qa(entry)
+            if chat_session is not None:
+                chat_session["learned_version"] = version
+        get_background_writer().put(job)
+    except OSError as e:
+        report_memory_error(LEARNED_QA_FILE, e)
 
 def load_learned_qa():
     """Load learned Q&A pairs."""
+    migrate_legacy_learned_qa()
+    return load_memory_file(LEARNED_QA_FILE, read_jsonl, [])
+
+def load_recent_learned_qa(n):
+    """Load the last n learned Q&A pairs without reading the whole log."""
+    migrate_legacy_learned_qa()
     try:
-        if os.path.exists(LEARNED_QA_FILE):
-            with open(LEARNED_QA_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    except:
+        return tail_jsonl(LEARNED_QA_FILE, n)
+    except FileNotFoundError:
         pass
+    except OSError as e:
+        report_memory_error(LEARNED_QA_FILE, e)
     return []
 
+QUESTION_NOISE_PATTERN = re.compile(r'[^\w\s]+')
+
+def normalize_question(question):
+    """Lowercase a question and strip punctuation and extra whitespace."""
+    return " ".join(QUESTION_NOISE_PATTERN.sub(" ", question.lower()).split())
+
+def find_learned_answer(question):
+    """Return a previously learned answer to the same question, if any.
+
+    The normalized-question lookup table is kept in session state and
+    rebuilt only when learned_qa.jsonl changes.
+    """
+    version = file_version(LEARNED_QA_FILE)
+    cached = st.session_state.get('_learned_answers')
+    if not cached or cached[0] != version:
+        # Later entries win, so the most recent answer is used
+        answers = {normalize_question(qa['question']): qa['answer'] for qa in load_learned_qa()}
+        cached = (version, answers)
+        st.session_state['_learned_answers'] = cached
+    return cached[1].get(normalize_question(question))
+
+LEARNED_CONTEXT_HEADER = "\n\n══════════════════════════════════════════════════════════════════════════════════\n                    LEARNED FROM PREVIOUS CONVERSATIONS\n══════════════════════════════════════════════════════════════════════════════════\n\n"
+
 def get_learned_context():
-    """Get learned Q&A as additional context."""
-    learned = load_learned_qa()
-    if not learned:
-        return ""
+    """Get learned Q&A as additional context.
+
+    The formatted text is kept in session state and rebuilt only when
+    learned_qa.jsonl changes on disk.
+    """
+    version = file_version(LEARNED_QA_FILE)
+    cached = st.session_state.get('_learned_context')
+    if cached and cached[0] == version:
+        return cached[1]
     
     # Get last 20 learned Q&As for context
-    recent = learned[-20:]
-    context = "\n\n══════════════════════════════════════════════════════════════════════════════════\n                    LEARNED FROM PREVIOUS CONVERSATIONS\n══════════════════════════════════════════════════════════════════════════════════\n\n"
-    
-    for qa in recent:
-        context += f"Q: {qa['question'][:100]}...\nA: {qa['answer'][:200]}...\n\n"
-    
+    recent = load_recent_learned_qa(20)
+    if not recent:
+        context = ""
+    else:
+        context = LEARNED_CONTEXT_HEADER + "".join(
+            f"Q: {qa['question'][:100]}...\nA: {qa['answer'][:200]}...\n\n"
+            for qa in recent
+        )
+    st.session_state['_learned_context'] = (version, context)
     return context
 
-def get_memory_stats():
-    """Get memory statistics."""
-    chat_count = len(load_chat_history())
-    learned_count = len(load_learned_qa())
-    return chat_count, learned_count
-
 from utils.database import get_database
 from utils.digipin import DIGIPINValidator
 
@@ -222,7 +577,10 @@ db = get_database()
 validator = DIGIPINValidator()
 
 # AAVA System Context for AI - GENERAL PURPOSE + AAVA KNOWLEDGE
-SYSTEM_CONTEXT = """You are an advanced AI assistant with comprehensive knowledge. You can help with ANY topic including:
+# Split into named sections: "core" and "guidelines" are always sent, the
+# rest only when the conversation touches their topic (see relevant_sections)
+SYSTEM_CONTEXT_SECTIONS = {
+    "core": """You are an advanced AI assistant with comprehensive knowledge. You can help with ANY topic including:
 
 🎓 **ACADEMICS & EDUCATION:**
 - All subjects: Math, Science, History, Geography, Literature, etc.
@@ -256,7 +614,8 @@ You also have DEEP EXPERTISE in AAVA (Authorised Address Validation Agency), par
 ║             COMPLETE AAVA KNOWLEDGE BASE - TRAINED ON ALL DOCS + CODE          ║
 ╚═══════════════════════════════════════════════════════════════════════════════╝
 
-══════════════════════════════════════════════════════════════════════════════════
+""",
+    "ecosystem": """══════════════════════════════════════════════════════════════════════════════════
                     PART 1: DHRUVA ECOSYSTEM OVERVIEW
 ══════════════════════════════════════════════════════════════════════════════════
 
@@ -292,7 +651,8 @@ A unified national digital addressing system with 4 core pillars:
 | **AIU** | Address Information User | Consumers of address data (e-commerce, banks) |
 | **AAVA** | Authorised Address Validation Agency | Validates address accuracy |
 
-══════════════════════════════════════════════════════════════════════════════════
+""",
+    "digipin": """══════════════════════════════════════════════════════════════════════════════════
                     PART 2: DIGIPIN TECHNICAL SPECIFICATIONS
 ══════════════════════════════════════════════════════════════════════════════════
 
@@ -383,7 +743,8 @@ Row 3 │   L   │   M   │   P   │   T   │  (Bottom = Lower Latitude)
 | Gateway of India, Mumbai | 18.9220°N, 72.8347°E | 4XX-XXX-XXXX |
 | MG Road, Bengaluru | 12.9716°N, 77.5946°E | 5XX-XXX-XXXX |
 
-══════════════════════════════════════════════════════════════════════════════════
+""",
+    "confidence": """══════════════════════════════════════════════════════════════════════════════════
                     PART 3: CONFIDENCE SCORE ALGORITHM
 ══════════════════════════════════════════════════════════════════════════════════
 
@@ -460,7 +821,8 @@ Score from field agent's on-site verification.
 | **D** | 50-59 | Poor - Low Reliability | ❌ Needs verification |
 | **F** | 0-49 | Fail - Unreliable | ❌ Do not use as-is |
 
-══════════════════════════════════════════════════════════════════════════════════
+""",
+    "validation": """══════════════════════════════════════════════════════════════════════════════════
                     PART 4: VALIDATION SYSTEM
 ══════════════════════════════════════════════════════════════════════════════════
 
@@ -517,7 +879,8 @@ PENDING → IN_PROGRESS → COMPLETED
 | HIGH | Important transactions |
 | URGENT | Emergency/legal requirements |
 
-══════════════════════════════════════════════════════════════════════════════════
+""",
+    "database": """══════════════════════════════════════════════════════════════════════════════════
                     PART 5: DATABASE SCHEMA
 ══════════════════════════════════════════════════════════════════════════════════
 
@@ -567,7 +930,8 @@ User consent artifacts for privacy compliance.
 ### 7. audit_logs
 Immutable action log with hash chaining for security.
 
-══════════════════════════════════════════════════════════════════════════════════
+""",
+    "pages": """══════════════════════════════════════════════════════════════════════════════════
                     PART 6: AAVA APPLICATION PAGES
 ══════════════════════════════════════════════════════════════════════════════════
 
@@ -613,7 +977,8 @@ Immutable action log with hash chaining for security.
 - Answer AAVA questions
 - System guidance
 
-══════════════════════════════════════════════════════════════════════════════════
+""",
+    "implementation": """══════════════════════════════════════════════════════════════════════════════════
                     PART 7: IMPLEMENTATION DETAILS (FROM CODE)
 ══════════════════════════════════════════════════════════════════════════════════
 
@@ -679,7 +1044,8 @@ result = calculator.calculate(address_data)
 # Returns: ConfidenceResult with score, grade, components, recommendations
 ```
 
-══════════════════════════════════════════════════════════════════════════════════
+""",
+    "compliance": """══════════════════════════════════════════════════════════════════════════════════
                     PART 8: COMPLIANCE STATUS (96.4% COMPLIANT)
 ══════════════════════════════════════════════════════════════════════════════════
 
@@ -693,7 +1059,8 @@ result = calculator.calculate(address_data)
 | Security | 6 | 4 ⚠️ | Minor items pending |
 | **TOTAL** | **55** | **53** | **96.4%** |
 
-══════════════════════════════════════════════════════════════════════════════════
+""",
+    "faq": """══════════════════════════════════════════════════════════════════════════════════
                     PART 9: FAQ - COMMON QUESTIONS
 ══════════════════════════════════════════════════════════════════════════════════
 
@@ -730,12 +1097,14 @@ A: System will reject it. Valid DIGIPIN must be exactly 10 characters from the a
 **Q: How is AAVA different from DARPAN?**
 A: DARPAN is the address repository (storage). AAVA is the validation agency (quality assurance).
 
-══════════════════════════════════════════════════════════════════════════════════
+""",
+    "commands": """══════════════════════════════════════════════════════════════════════════════════
                     PART 10: QUICK COMMANDS I CAN EXECUTE
 ══════════════════════════════════════════════════════════════════════════════════
 
 **DIGIPIN Operations:**
 - `encode 28.6139, 77.2090` → Convert coordinates to DIGIPIN
+- `encode 28.61, 77.20; 19.07, 72.87` → Convert several coordinates at once
 - `decode 3PJK4M5L2T` → Get coordinates from DIGIPIN
 - `validate 3PJ-K4M-5L2T` → Check if DIGIPIN format is valid
 
@@ -745,7 +1114,8 @@ A: DARPAN is the address repository (storage). AAVA is the validation agency (qu
 **Help:**
 - Ask anything about AAVA, DIGIPIN, validation, confidence scores!
 
-══════════════════════════════════════════════════════════════════════════════════
+""",
+    "guidelines": """══════════════════════════════════════════════════════════════════════════════════
                          RESPONSE GUIDELINES
 ══════════════════════════════════════════════════════════════════════════════════
 
@@ -768,9 +1138,39 @@ A: DARPAN is the address repository (storage). AAVA is the validation agency (qu
 - Help users understand and use the DHRUVA system effectively
 
 You are a versatile, knowledgeable AI assistant. Help users learn and solve any problem!"""
+}
+
+ALWAYS_SENT_SECTIONS = ("core", "guidelines")
+
+# Topic keywords that pull each optional section into the context
+SECTION_TRIGGERS = {
+    "ecosystem": re.compile(r'aava|dhruva|darpan|divya|ecosystem|\baip\b|\baia\b|\baiu\b|mapper|department of posts', re.IGNORECASE),
+    "digipin": re.compile(r'digipin|encod|decod|geocode|grid|latitude|longitude|coordinate', re.IGNORECASE),
+    "confidence": re.compile(r'confidence|score|grade|\bdsr\b|\bpvs\b|freshness|spatial|delivery success', re.IGNORECASE),
+    "validation": re.compile(r'validat|verif|agent|priority|workflow', re.IGNORECASE),
+    "database": re.compile(r'database|schema|table|sqlite|column', re.IGNORECASE),
+    "pages": re.compile(r'page|dashboard|portal|admin|navigat|screen|\bui\b', re.IGNORECASE),
+    "implementation": re.compile(r'\bcode\b|module|implement|python|function|streamlit|tech stack', re.IGNORECASE),
+    "compliance": re.compile(r'complian|security|secure|audit', re.IGNORECASE),
+    "faq": re.compile(r'aava|digipin|pin ?code|plus code|offline|accura', re.IGNORECASE),
+    "commands": re.compile(r'command|what can you|help|stats', re.IGNORECASE),
+}
+
+def relevant_sections(text):
+    """Names of the system context sections that text calls for."""
+    return {
+        name for name in SYSTEM_CONTEXT_SECTIONS
+        if name in ALWAYS_SENT_SECTIONS or SECTION_TRIGGERS[name].search(text)
+    }
 
-# Custom CSS
-st.markdown("""
+@st.cache_data(show_spinner=False)
+def avatar_base64(path, mtime):
+    """Base64-encode an avatar image; mtime keys the cache so edits are picked up."""
+    with open(path, 'rb') as f:
+        return base64.b64encode(f.read()).decode()
+
+# Static page markup, emitted once per script run
+CHAT_CSS = """
 <style>
     /* Sidebar - Wider to prevent text truncation */
     [data-testid="stSidebar"] { min-width: 280px !important; width: 280px !important; }
@@ -797,131 +1197,9 @@ st.markdown("""
         border-radius: 12px;
     }
 </style>
-""", unsafe_allow_html=True)
-
-# Initialize Gemini model
-@st.cache_resource
-def get_gemini_model(api_key):
-    """Initialize and cache Gemini model."""
-    try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('models/gemini-2.0-flash')
-        return model
-    except Exception as e:
-        return None
-
-def get_ai_response(model, user_input, history):
-    """Get response from Gemini AI with learned context."""
-    try:
-        # Build conversation
-        chat = model.start_chat(history=[])
-        
-        # Get learned context from previous conversations
-        learned_context = get_learned_context()
-        
-        # Send system context + learned context first
-        full_context = SYSTEM_CONTEXT + learned_context + "\n\nRespond with: 'Ready to help!'"
-        chat.send_message(full_context)
-        
-        # Send previous messages for context (more messages now)
-        for msg in history[-10:]:  # Last 10 messages for better context
-            if msg["role"] == "user":
-                chat.send_message(msg["content"])
-            # Model responses are automatically in history
-        
-        # Get response for current input
-        response = chat.send_message(user_input)
-        response_text = response.text
-        
-        # Learn from this conversation (save Q&A pair)
-        if len(user_input) > 10 and len(response_text) > 50:  # Only save meaningful exchanges
-            save_learned_qa(user_input, response_text)
-        
-        return response_text
-    except Exception as e:
-        return f"❌ AI Error: {str(e)}\n\nPlease check your API key or try again."
-
-def process_digipin_commands(user_input):
-    """Process DIGIPIN commands locally."""
-    user_upper = user_input.upper()
-    user_lower = user_input.lower()
-    
-    # Encode coordinates
-    coord_pattern = r'encode\s*(\d+\.?\d*)[,\s]+(\d+\.?\d*)'
-    coord_match = re.search(coord_pattern, user_lower)
-    if coord_match:
-        try:
-            lat = float(coord_match.group(1))
-            lon = float(coord_match.group(2))
-            result = validator.encode(lat, lon)
-            formatted = validator._format_digipin(result.digipin)
-            return f"""✅ **DIGIPIN Encoded!**
-
-📍 **Coordinates:** {lat}°N, {lon}°E
-🔢 **DIGIPIN:** `{formatted}`
-
-📐 Grid: {result.bounds['south']:.4f}° to {result.bounds['north']:.4f}°N"""
-        except Exception as e:
-            return f"❌ Encoding error: {str(e)}"
-    
-    # Decode DIGIPIN
-    decode_pattern = r'decode\s*([23456789CFJKLMPT-]{10,14})'
-    decode_match = re.search(decode_pattern, user_upper)
-    if decode_match:
-        digipin = decode_match.group(1).replace('-', '')
-        try:
-            result = validator.decode(digipin)
-            return f"""✅ **DIGIPIN Decoded!**
-
-🔢 **DIGIPIN:** `{validator._format_digipin(digipin)}`
-📍 **Location:** {result.latitude:.6f}°N, {result.longitude:.6f}°E"""
-        except Exception as e:
-            return f"❌ Decoding error: {str(e)}"
-    
-    # Validate DIGIPIN  
-    validate_pattern = r'validate\s*([23456789CFJKLMPT-]{10,14})'
-    validate_match = re.search(validate_pattern, user_upper)
-    if validate_match:
-        digipin = validate_match.group(1)
-        is_valid, msg = validator.validate_format(digipin)
-        if is_valid:
-            result = validator.decode(digipin.replace('-', ''))
-            return f"""✅ **Valid DIGIPIN!**
-
-🔢 `{validator._format_digipin(digipin.replace('-', ''))}`
-📍 {result.latitude:.6f}°N, {result.longitude:.6f}°E"""
-        else:
-            return f"❌ **Invalid:** {msg}"
-    
-    # Stats
-    if "stats" in user_lower or "statistics" in user_lower:
-        try:
-            stats = db.get_dashboard_stats()
-            return f"""📊 **System Stats**
-
-📍 Addresses: {stats.get('total_addresses', 0):,}
-📋 Validations: {stats.get('total_validations', 0):,}
-⏳ Pending: {stats.get('pending_validations', 0):,}
-👥 Active Agents: {stats.get('active_agents', 0):,}"""
-        except:
-            pass
-    
-    return None
+"""
 
-# Header
-st.markdown("""
-<div class="chat-header">
-    <h1 style="margin: 0;">🤖 AAVA AI Assistant</h1>
-    <p style="margin: 0.5rem 0 0 0;">
-        Ask me anything about AAVA, DIGIPIN, or address validation
-    </p>
-</div>
-""", unsafe_allow_html=True)
-
-# Sidebar - Premium Design
-with st.sidebar:
-    # Custom CSS for premium sidebar
-    st.markdown("""
+SIDEBAR_CSS = """
     <style>
     .sidebar-header {
         background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
@@ -994,15 +1272,271 @@ with st.sidebar:
         padding: 0.3rem 0.5rem !important;
     }
     </style>
-    """, unsafe_allow_html=True)
-    
-    # Header with image and dark blue background - properly centered
-    st.markdown("""
+    """
+
+CHAT_HEADER_HTML = """
+<div class="chat-header">
+    <h1 style="margin: 0;">🤖 AAVA AI Assistant</h1>
+    <p style="margin: 0.5rem 0 0 0;">
+        Ask me anything about AAVA, DIGIPIN, or address validation
+    </p>
+</div>
+"""
+
+FOOTER_BADGE_HTML = """
+<div style="text-align: center; margin: 30px 0 80px 0;">
+    <span style="
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        padding: 8px 20px;
+        border-radius: 20px;
+        font-size: 0.75rem;
+        font-weight: 500;
+        box-shadow: 0 2px 10px rgba(102, 126, 234, 0.3);
+    ">
+        🤖 AAVA AI • 🧠 Persistent Memory • 🇮🇳 DHRUVA Digital Address
+    </span>
+</div>
+"""
+
+SIDEBAR_HEADER_TEMPLATE = """
     <div style="background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%); padding: 20px; border-radius: 12px; margin-bottom: 15px; text-align: center;">
         <img src="data:image/jpeg;base64,{}" style="width: 60px; height: 60px; border-radius: 50%; object-fit: cover; border: 3px solid #4a90d9; margin-bottom: 10px;">
         <h3 style="margin: 0; color: #ffffff; font-weight: 600; font-size: 1.3rem;">AAVA AI</h3>
     </div>
-    """.format(__import__('base64').b64encode(open(ASSISTANT_AVATAR, 'rb').read()).decode()), unsafe_allow_html=True)
+    """
+
+@st.cache_data(show_spinner=False)
+def sidebar_header_html(mtime):
+    """Render the sidebar avatar header; mtime keys the cache so a new avatar is picked up."""
+    return SIDEBAR_HEADER_TEMPLATE.format(avatar_base64(ASSISTANT_AVATAR, mtime))
+
+# Custom CSS
+st.markdown(CHAT_CSS, unsafe_allow_html=True)
+
+# Initialize Gemini model
+@st.cache_resource(show_spinner=False)
+def load_gemini_model(api_key):
+    """Initialize and cache the Gemini model, once per API key per process."""
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel('models/gemini-2.0-flash')
+
+def get_gemini_model(api_key):
+    """Get the cached Gemini model, or None if it cannot be created.
+
+    Failures are not cached, so a later prompt retries the setup.
+    """
+    try:
+        return load_gemini_model(api_key)
+    except Exception as e:
+        return None
+
+# Gemini sees the system context plus at most the last AI_HISTORY_WINDOW
+# messages when a chat is opened; a chat that has grown by another
+# AI_HISTORY_WINDOW messages since is reopened with a fresh window
+AI_HISTORY_WINDOW = 10
+AI_CHAT_MAX_HISTORY = 2 + 2 * AI_HISTORY_WINDOW
+
+def start_gemini_chat(model, chat_id, history, routing_text):
+    """Open a Gemini chat seeded with the system context and recent history.
+
+    The context and prior turns go in as the chat's initial history, so no
+    extra round trips are needed to prime it.
+    """
+    sections = relevant_sections(routing_text)
+    system_context = "".join(
+        section for name, section in SYSTEM_CONTEXT_SECTIONS.items() if name in sections
+    )
+    seed = [
+        {"role": "user", "parts": [system_context + get_learned_context()]},
+        {"role": "model", "parts": ["Ready to help!"]},
+    ]
+    # Previous messages for context
+    seed += [
+        {"role": "user" if msg["role"] == "user" else "model", "parts": [msg["content"]]}
+        for msg in history[-AI_HISTORY_WINDOW:]
+    ]
+    session = {
+        "chat_id": chat_id,
+        "model": model,
+        "learned_version": file_version(LEARNED_QA_FILE),
+        "sections": sections,
+        "chat": model.start_chat(history=seed),
+    }
+    st.session_state['_gemini_chat'] = session
+    return session
+
+def get_ai_response(model, user_input, history, chat_id):
+    """Get response from Gemini AI with learned context.
+
+    The Gemini chat is kept in session state per conversation, so each turn
+    is a single send_message. It is rebuilt (locally, without API calls)
+    when the conversation changes, another session changes learned_qa.jsonl,
+    or its history outgrows AI_CHAT_MAX_HISTORY, which slides the window
+    sent to Gemini back to the last AI_HISTORY_WINDOW messages.
+    """
+    # Repeat questions are answered from what was learned before
+    learned_answer = find_learned_answer(user_input)
+    if learned_answer and len(learned_answer) > 50:
+        return learned_answer
+    
+    try:
+        recent_user_text = " ".join(
+            [msg["content"] for msg in history[-AI_HISTORY_WINDOW:] if msg["role"] == "user"] + [user_input]
+        )
+        session = st.session_state.get('_gemini_chat')
+        if (not session
+                or session["chat_id"] != chat_id
+                or session["model"] is not model
+                or session["learned_version"] != file_version(LEARNED_QA_FILE)
+                or len(session["chat"].history) > AI_CHAT_MAX_HISTORY):
+            session = start_gemini_chat(model, chat_id, history, recent_user_text)
+        
+        # Knowledge sections this turn needs that the chat has not seen yet
+        # are sent along with the question
+        wanted = relevant_sections(user_input) - session["sections"]
+        new_sections = [name for name in SYSTEM_CONTEXT_SECTIONS if name in wanted]
+        message = user_input
+        if new_sections:
+            message = "".join(SYSTEM_CONTEXT_SECTIONS[name] for name in new_sections) + "\n\n" + user_input
+            session["sections"].update(new_sections)
+        
+        response = session["chat"].send_message(message)
+        response_text = response.text
+        
+        # Learn from this conversation (save Q&A pair)
+        if len(user_input) > 10 and len(response_text) > 50:  # Only save meaningful exchanges
+            save_learned_qa(user_input, response_text, chat_session=session)
+        
+        return response_text
+    except Exception as e:
+        st.session_state.pop('_gemini_chat', None)
+        return f"❌ AI Error: {str(e)}\n\nPlease check your API key or try again."
+
+# Local command patterns, compiled once
+COORD_PATTERN = re.compile(r'encode\s*(\d+\.?\d*)[,\s]+(\d+\.?\d*)')
+# "encode lat,lon; lat,lon; ..." - the pairs are picked out of group 1
+BATCH_ENCODE_PATTERN = re.compile(r'encode\s*((?:\d+\.?\d*[,\s]+\d+\.?\d*[;\s]*){2,})')
+COORD_PAIR_PATTERN = re.compile(r'(\d+\.?\d*)[,\s]+(\d+\.?\d*)')
+DECODE_PATTERN = re.compile(r'DECODE\s*([23456789CFJKLMPT-]{10,14})')
+VALIDATE_PATTERN = re.compile(r'VALIDATE\s*([23456789CFJKLMPT-]{10,14})')
+STATS_PATTERN = re.compile(r'stat(?:istic)?s')
+
+def encode_batch(pairs):
+    """Encode several (lat, lon) string pairs and return a Markdown table."""
+    rows = ["| # | Coordinates | DIGIPIN |", "|---|-------------|---------|"]
+    for i, (lat_text, lon_text) in enumerate(pairs, 1):
+        lat, lon = float(lat_text), float(lon_text)
+        result = validator.encode(lat, lon)
+        digipin = f"`{result.formatted}`" if result.valid else f"❌ {result.error}"
+        rows.append(f"| {i} | {lat}°N, {lon}°E | {digipin} |")
+    return f"✅ **{len(pairs)} coordinates encoded!**\n\n" + "\n".join(rows)
+
+def handle_batch_encode(match):
+    """Encode several coordinates at once.
+
+    Returns None when fewer than two pairs are found (the pattern can
+    match one pair by backtracking into its digits), so the single-pair
+    encoder handles it instead.
+    """
+    pairs = COORD_PAIR_PATTERN.findall(match.group(1))
+    if len(pairs) < 2:
+        return None
+    try:
+        return encode_batch(pairs)
+    except Exception as e:
+        return f"❌ Encoding error: {str(e)}"
+
+def handle_encode(match):
+    """Encode one coordinate pair."""
+    try:
+        lat = float(match.group(1))
+        lon = float(match.group(2))
+        result = validator.encode(lat, lon)
+        if not result.valid:
+            return f"❌ Encoding error: {result.error}"
+        return f"""✅ **DIGIPIN Encoded!**
+
+📍 **Coordinates:** {lat}°N, {lon}°E
+🔢 **DIGIPIN:** `{result.formatted}`
+
+📐 Grid: {result.bounds['min_lat']:.6f}° to {result.bounds['max_lat']:.6f}°N"""
+    except Exception as e:
+        return f"❌ Encoding error: {str(e)}"
+
+def handle_decode(match):
+    """Decode a DIGIPIN to coordinates."""
+    digipin = match.group(1).replace('-', '')
+    try:
+        result = validator.decode(digipin)
+        if not result.valid:
+            return f"❌ Decoding error: {result.error}"
+        return f"""✅ **DIGIPIN Decoded!**
+
+🔢 **DIGIPIN:** `{result.formatted}`
+📍 **Location:** {result.center_lat:.6f}°N, {result.center_lon:.6f}°E"""
+    except Exception as e:
+        return f"❌ Decoding error: {str(e)}"
+
+def handle_validate(match):
+    """Check a DIGIPIN's format and show where it points."""
+    digipin = match.group(1)
+    is_valid, msg = validator.validate_with_details(digipin)
+    if not is_valid:
+        return f"❌ **Invalid:** {msg}"
+    result = validator.decode(digipin)
+    return f"""✅ **Valid DIGIPIN!**
+
+🔢 `{result.formatted}`
+📍 {result.center_lat:.6f}°N, {result.center_lon:.6f}°E"""
+
+def handle_stats(match):
+    """Show system statistics."""
+    try:
+        stats = db.get_dashboard_stats()
+        return f"""📊 **System Stats**
+
+📍 Addresses: {stats.get('total_addresses', 0):,}
+📋 Validations: {stats.get('total_validations', 0):,}
+⏳ Pending: {stats.get('pending_validations', 0):,}
+👥 Active Agents: {stats.get('active_agents', 0):,}"""
+    except:
+        return None
+
+# Local commands in priority order: (pattern, searched text case, handler)
+COMMAND_HANDLERS = (
+    (BATCH_ENCODE_PATTERN, 'lower', handle_batch_encode),
+    (COORD_PATTERN, 'lower', handle_encode),
+    (DECODE_PATTERN, 'upper', handle_decode),
+    (VALIDATE_PATTERN, 'upper', handle_validate),
+    (STATS_PATTERN, 'lower', handle_stats),
+)
+# Any local command mentions one of these words; other messages skip the table
+COMMAND_KEYWORD_PATTERN = re.compile(r'encode|decode|validate|stat', re.IGNORECASE)
+
+def process_digipin_commands(user_input):
+    """Process DIGIPIN commands locally."""
+    if not COMMAND_KEYWORD_PATTERN.search(user_input):
+        return None
+    text = {'lower': user_input.lower(), 'upper': user_input.upper()}
+    for pattern, case, handler in COMMAND_HANDLERS:
+        match = pattern.search(text[case])
+        if match:
+            reply = handler(match)
+            if reply is not None:
+                return reply
+    return None
+
+# Header
+st.markdown(CHAT_HEADER_HTML, unsafe_allow_html=True)
+
+# Sidebar - Premium Design
+with st.sidebar:
+    # Custom CSS for premium sidebar
+    st.markdown(SIDEBAR_CSS, unsafe_allow_html=True)
+    
+    # Header with image and dark blue background - properly centered
+    st.markdown(sidebar_header_html(os.path.getmtime(ASSISTANT_AVATAR)), unsafe_allow_html=True)
     
     # New Chat Button - Prominent
     if st.button("✨ New Chat", use_container_width=True, type="primary"):
@@ -1015,7 +1549,7 @@ with st.sidebar:
             save_current_chat(st.session_state.chat_id, st.session_state.chat_name, st.session_state.chat_messages)
         # Create new chat
         st.session_state.chat_messages = []
-        save_chat_history([])
+        save_chat_history([], force=True)
         st.session_state.chat_id = generate_chat_id()
         st.session_state.chat_name = "New Chat"
         st.rerun()
@@ -1032,7 +1566,7 @@ with st.sidebar:
     
     all_chats = load_all_chats()
     if all_chats:
-        for chat_id, chat_data in sorted(all_chats.items(), key=lambda x: x[1].get('updated_at', ''), reverse=True)[:10]:
+        for chat_id, chat_data in heapq.nlargest(RECENT_CHATS_SHOWN, all_chats.items(), key=chat_updated_at):
             chat_name = chat_data.get('name', 'Unnamed Chat')
             is_current = chat_id == st.session_state.get('chat_id')
             time_left = get_time_remaining(chat_data)
@@ -1048,8 +1582,8 @@ with st.sidebar:
                         save_current_chat(st.session_state.chat_id, st.session_state.chat_name, st.session_state.chat_messages)
                     st.session_state.chat_id = chat_id
                     st.session_state.chat_name = chat_name
-                    st.session_state.chat_messages = chat_data.get('messages', [])
-                    save_chat_history(st.session_state.chat_messages)
+                    st.session_state.chat_messages = list(load_chat_messages(chat_id))
+                    save_chat_history(st.session_state.chat_messages, force=True)
                     st.rerun()
             with col2:
                 if st.button("✏️", key=f"edit_{chat_id}", help="Rename chat"):
@@ -1070,12 +1604,9 @@ with st.sidebar:
                 c1, c2 = st.columns(2)
                 with c1:
                     if st.button("Save", key=f"save_{chat_id}", use_container_width=True):
-                        chats = load_all_chats()
-                        if chat_id in chats:
-                            chats[chat_id]['name'] = new_name
-                            save_all_chats(chats)
-                            if chat_id == st.session_state.get('chat_id'):
-                                st.session_state.chat_name = new_name
+                        rename_chat(chat_id, new_name)
+                        if chat_id == st.session_state.get('chat_id'):
+                            st.session_state.chat_name = new_name
                         del st.session_state[f"editing_{chat_id}"]
                         st.rerun()
                 with c2:
@@ -1113,16 +1644,13 @@ if "pending_question" in st.session_state:
 
 # Display chat history
 for msg in st.session_state.chat_messages:
-    if msg["role"] == "assistant":
-        avatar = ASSISTANT_AVATAR if os.path.exists(ASSISTANT_AVATAR) else None
-    else:
-        avatar = USER_AVATAR if os.path.exists(USER_AVATAR) else None
+    avatar = ASSISTANT_AVATAR_ICON if msg["role"] == "assistant" else USER_AVATAR_ICON
     with st.chat_message(msg["role"], avatar=avatar):
         st.markdown(msg["content"])
 
 # Welcome message if empty
 if not st.session_state.chat_messages:
-    with st.chat_message("assistant", avatar=ASSISTANT_AVATAR if os.path.exists(ASSISTANT_AVATAR) else None):
+    with st.chat_message("assistant", avatar=ASSISTANT_AVATAR_ICON):
         st.markdown("""👋 **Hello! I'm AAVA AI Assistant**
 
 Ask me anything - I'm here to help! 💬
@@ -1140,11 +1668,11 @@ prompt = pending_prompt if pending_prompt else user_input
 if prompt:
     # Add user message
     st.session_state.chat_messages.append({"role": "user", "content": prompt})
-    with st.chat_message("user", avatar=USER_AVATAR if os.path.exists(USER_AVATAR) else None):
+    with st.chat_message("user", avatar=USER_AVATAR_ICON):
         st.markdown(prompt)
     
     # Generate response
-    with st.chat_message("assistant", avatar=ASSISTANT_AVATAR if os.path.exists(ASSISTANT_AVATAR) else None):
+    with st.chat_message("assistant", avatar=ASSISTANT_AVATAR_ICON):
         # First try local commands
         local_response = process_digipin_commands(prompt)
         
@@ -1155,7 +1683,7 @@ if prompt:
             with st.spinner("🤔 Thinking..."):
                 model = get_gemini_model(st.session_state.gemini_key)
                 if model:
-                    response = get_ai_response(model, prompt, st.session_state.chat_messages[:-1])
+                    response = get_ai_response(model, prompt, st.session_state.chat_messages[-AI_HISTORY_WINDOW - 1:-1], st.session_state.chat_id)
                     st.markdown(response)
                 else:
                     response = "❌ Could not initialize AI. Check your API key."
@@ -1217,18 +1745,4 @@ with cols[3]:
         st.rerun()
 
 # Elegant footer badge - centered below quick actions
-st.markdown("""
-<div style="text-align: center; margin: 30px 0 80px 0;">
-    <span style="
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 8px 20px;
-        border-radius: 20px;
-        font-size: 0.75rem;
-        font-weight: 500;
-        box-shadow: 0 2px 10px rgba(102, 126, 234, 0.3);
-    ">
-        🤖 AAVA AI • 🧠 Persistent Memory • 🇮🇳 DHRUVA Digital Address
-    </span>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(FOOTER_BADGE_HTML, unsafe_allow_html=True)
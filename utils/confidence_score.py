@@ -49,6 +49,8 @@ Grades:
 
 import math
 import random
+from bisect import bisect_right
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
@@ -92,6 +94,29 @@ GRADE_THRESHOLDS = [
     (0, 'F', 'Fail - Unreliable')
 ]
 
+# Grade lookup tables (ascending): index = bisect_right(GRADE_BINS, score)
+GRADE_BINS = [t for t, _, _ in reversed(GRADE_THRESHOLDS[:-1])]  # [50, 60, 70, 80, 90]
+GRADE_LABELS = [g for _, g, _ in reversed(GRADE_THRESHOLDS)]     # ['F', 'D', ..., 'A+']
+GRADE_DESCRIPTIONS = [d for _, _, d in reversed(GRADE_THRESHOLDS)]
+
+
+def _grade_index(score: float) -> int:
+    """Index into the grade tables for a score; NaN gets the lowest grade."""
+    if math.isnan(score):
+        return 0
+    return bisect_right(GRADE_BINS, score)
+
+
+# UI colors per grade
+GRADE_COLORS = {
+    'A+': '#00C853',  # Green
+    'A': '#00E676',
+    'B': '#FFEB3B',   # Yellow
+    'C': '#FFC107',   # Amber
+    'D': '#FF9800',   # Orange
+    'F': '#F44336',   # Red
+}
+
 # Default parameters
 DEFAULT_HALF_LIFE_DAYS = 180  # Days for temporal decay half-life
 DEFAULT_REFERENCE_DISTANCE = 50  # Meters for spatial consistency reference
@@ -126,6 +151,25 @@ class PhysicalVerification:
     notes: Optional[str] = None
 
 
+@dataclass
+class DeliveryColumns:
+    """Column-wise (struct-of-arrays) view of a delivery history."""
+    timestamps: Tuple[datetime, ...] = ()
+    statuses: Tuple[DeliveryStatus, ...] = ()
+    lats: Tuple[Optional[float], ...] = ()
+    lons: Tuple[Optional[float], ...] = ()
+    
+    @classmethod
+    def from_records(cls, records: List[DeliveryRecord]) -> 'DeliveryColumns':
+        """Build the columns from delivery records in a single pass."""
+        if not records:
+            return cls()
+        return cls(*zip(*(
+            (d.timestamp, d.status, d.actual_lat, d.actual_lon)
+            for d in records
+        )))
+
+
 @dataclass
 class AddressData:
     """Complete address data for scoring."""
@@ -136,6 +180,10 @@ class AddressData:
     deliveries: List[DeliveryRecord] = field(default_factory=list)
     verifications: List[PhysicalVerification] = field(default_factory=list)
     last_updated: Optional[datetime] = None
+    
+    def delivery_columns(self) -> DeliveryColumns:
+        """Column-wise view of the current delivery records."""
+        return DeliveryColumns.from_records(self.deliveries)
 
 
 @dataclass
@@ -232,15 +280,17 @@ class ConfidenceScoreCalculator:
         """
         as_of_date = as_of_date or datetime.now()
         
-        # Calculate each component
-        dsr = self._calculate_delivery_success(address.deliveries)
+        # Calculate each component (deliveries are read column-wise,
+        # built once and shared by every component)
+        deliveries = address.delivery_columns()
+        dsr = self._calculate_delivery_success(deliveries)
         sc = self._calculate_spatial_consistency(
-            address.deliveries, 
+            deliveries, 
             address.stated_lat, 
             address.stated_lon
         )
         tf = self._calculate_temporal_freshness(
-            address.deliveries,
+            deliveries,
             address.verifications,
             as_of_date
         )
@@ -296,10 +346,7 @@ class ConfidenceScoreCalculator:
         # Determine coverage
         coverage = {
             'has_deliveries': len(address.deliveries) > 0,
-            'has_coordinates': any(
-                d.actual_lat is not None and d.actual_lon is not None 
-                for d in address.deliveries
-            ),
+            'has_coordinates': sc['data_points'] > 0,
             'has_verifications': len(address.verifications) > 0,
             'is_recent': tf['value'] > 0.5
         }
@@ -323,7 +370,7 @@ class ConfidenceScoreCalculator:
     
     def _calculate_delivery_success(
         self, 
-        deliveries: List[DeliveryRecord]
+        deliveries: DeliveryColumns
     ) -> Dict[str, Any]:
         """
         Calculate Delivery Success Rate (DSR).
@@ -336,11 +383,10 @@ class ConfidenceScoreCalculator:
             - DELIVERED_WITH_DIFFICULTY: 50
             - FAILED: 0
         """
-        # Filter out pending deliveries
-        completed = [
-            d for d in deliveries 
-            if d.status != DeliveryStatus.PENDING
-        ]
+        # Count by status (single pass), filtering out pending deliveries
+        status_counts = Counter(deliveries.statuses)
+        status_counts.pop(DeliveryStatus.PENDING, None)
+        completed = sum(status_counts.values())
         
         if not completed:
             return {
@@ -349,36 +395,30 @@ class ConfidenceScoreCalculator:
                 'data_points': 0
             }
         
-        # Calculate total points
-        total_points = 0
-        for delivery in completed:
-            points = DELIVERY_POINTS.get(delivery.status, 0)
-            if points is not None:
-                total_points += points
+        # Score from the counts
+        total_points = sum(
+            DELIVERY_POINTS[status] * count
+            for status, count in status_counts.items()
+        )
         
         # Normalize
-        max_possible = len(completed) * 100
+        max_possible = completed * 100
         dsr = total_points / max_possible if max_possible > 0 else 0
         
-        # Count by status
-        status_counts = {}
-        for d in completed:
-            status_counts[d.status.value] = status_counts.get(d.status.value, 0) + 1
-        
-        description = f"{len(completed)} deliveries: " + ", ".join(
-            f"{count} {status.lower()}" 
+        description = f"{completed} deliveries: " + ", ".join(
+            f"{count} {status.value.lower()}" 
             for status, count in status_counts.items()
         )
         
         return {
             'value': dsr,
             'description': description,
-            'data_points': len(completed)
+            'data_points': completed
         }
     
     def _calculate_spatial_consistency(
         self,
-        deliveries: List[DeliveryRecord],
+        deliveries: DeliveryColumns,
         stated_lat: float,
         stated_lon: float
     ) -> Dict[str, Any]:
@@ -393,8 +433,8 @@ class ConfidenceScoreCalculator:
         """
         # Get deliveries with coordinates
         with_coords = [
-            d for d in deliveries
-            if d.actual_lat is not None and d.actual_lon is not None
+            (lat, lon) for lat, lon in zip(deliveries.lats, deliveries.lons)
+            if lat is not None and lon is not None
         ]
         
         if not with_coords:
@@ -404,17 +444,8 @@ class ConfidenceScoreCalculator:
                 'data_points': 0
             }
         
-        # Calculate distances
-        distances = []
-        for d in with_coords:
-            dist = self._haversine_distance(
-                stated_lat, stated_lon,
-                d.actual_lat, d.actual_lon
-            )
-            distances.append(dist)
-        
         # Calculate average distance
-        avg_distance = sum(distances) / len(distances)
+        avg_distance = self._mean_distance_from(stated_lat, stated_lon, with_coords)
         
         # Apply Gaussian-like scoring
         # Score decreases as average distance increases
@@ -431,7 +462,7 @@ class ConfidenceScoreCalculator:
     
     def _calculate_temporal_freshness(
         self,
-        deliveries: List[DeliveryRecord],
+        deliveries: DeliveryColumns,
         verifications: List[PhysicalVerification],
         as_of_date: datetime
     ) -> Dict[str, Any]:
@@ -445,13 +476,14 @@ class ConfidenceScoreCalculator:
             where λ = ln(2) / half_life_days
         """
         # Find most recent successful event
-        last_event_date = None
+        successful = (DeliveryStatus.DELIVERED, DeliveryStatus.DELIVERED_WITH_DIFFICULTY)
         
         # Check deliveries
-        for d in deliveries:
-            if d.status in [DeliveryStatus.DELIVERED, DeliveryStatus.DELIVERED_WITH_DIFFICULTY]:
-                if last_event_date is None or d.timestamp > last_event_date:
-                    last_event_date = d.timestamp
+        last_event_date = max(
+            (ts for ts, status in zip(deliveries.timestamps, deliveries.statuses)
+             if status in successful),
+            default=None
+        )
         
         # Check verifications
         for v in verifications:
@@ -540,10 +572,8 @@ class ConfidenceScoreCalculator:
     
     def _get_grade(self, score: float) -> Tuple[str, str]:
         """Get letter grade and description for a score."""
-        for threshold, grade, description in GRADE_THRESHOLDS:
-            if score >= threshold:
-                return grade, description
-        return 'F', 'Fail - Unreliable'
+        index = _grade_index(score)
+        return GRADE_LABELS[index], GRADE_DESCRIPTIONS[index]
     
     def _generate_recommendations(
         self,
@@ -586,6 +616,35 @@ class ConfidenceScoreCalculator:
         
         return recommendations
     
+    def _mean_distance_from(
+        self,
+        lat: float, lon: float,
+        points: List[Tuple[float, float]]
+    ) -> float:
+        """
+        Mean haversine distance in meters from (lat, lon) to each point.
+        
+        Same formula as _haversine_distance, with the reference-point
+        terms computed once instead of per point.
+        """
+        R = 6371000  # Earth radius in meters
+        radians, sin, cos = math.radians, math.sin, math.cos
+        
+        lat_rad = radians(lat)
+        cos_lat = cos(lat_rad)
+        
+        total = 0.0
+        for p_lat, p_lon in points:
+            p_lat_rad = radians(p_lat)
+            a = (
+                sin((p_lat_rad - lat_rad) / 2) ** 2 +
+                cos_lat * cos(p_lat_rad) *
+                sin(radians(p_lon - lon) / 2) ** 2
+            )
+            total += 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+        
+        return R * total / len(points)
+    
     def _haversine_distance(
         self,
         lat1: float, lon1: float,
@@ -831,22 +890,11 @@ def calculate_score(address: AddressData) -> float:
 
 def get_grade(score: float) -> str:
     """Get letter grade for a score."""
-    for threshold, grade, _ in GRADE_THRESHOLDS:
-        if score >= threshold:
-            return grade
-    return 'F'
+    return GRADE_LABELS[_grade_index(score)]
 
 def get_grade_color(grade: str) -> str:
     """Get color for a grade (for UI display)."""
-    colors = {
-        'A+': '#00C853',  # Green
-        'A': '#00E676',
-        'B': '#FFEB3B',   # Yellow
-        'C': '#FFC107',   # Amber
-        'D': '#FF9800',   # Orange
-        'F': '#F44336',   # Red
-    }
-    return colors.get(grade, '#9E9E9E')
+    return GRADE_COLORS.get(grade, '#9E9E9E')
 
 
 # =============================================================================
@@ -73,6 +73,28 @@ class DeliveryStatus(Enum):
     PENDING = "PENDING"
 
 
+# =============================================================================
+# TRANSACTION SUPPORT
+# =============================================================================
+
+class _DeferredCommitConnection:
+    """
+    Connection wrapper used inside DatabaseManager.transaction().
+    
+    Individual CRUD methods call conn.commit() after each write; while a
+    transaction is open those commits are deferred until it completes.
+    """
+    
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+    
+    def commit(self):
+        """No-op; the enclosing transaction commits once at the end."""
+    
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
 # =============================================================================
 # DATABASE MANAGER
 # =============================================================================
@@ -126,12 +148,45 @@ class DatabaseManager:
             # Enable foreign keys
             self._local.connection.execute("PRAGMA foreign_keys = ON")
         
+        connection = self._local.connection
         try:
-            yield self._local.connection
+            yield connection
         except Exception as e:
-            self._local.connection.rollback()
+            # Inside transaction() only the transaction itself rolls back,
+            # so a caught error can't silently discard its earlier writes
+            if not isinstance(connection, _DeferredCommitConnection):
+                connection.rollback()
             raise e
     
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into a single transaction.
+        
+        Every DatabaseManager call made inside the block shares one commit,
+        issued when the block exits; any exception rolls all of them back.
+        Nested transaction() blocks join the outer transaction.
+        
+        Example:
+            with db.transaction():
+                db.create_address({...})
+                db.bulk_create_deliveries([...])
+        """
+        with self.get_connection() as conn:
+            if isinstance(conn, _DeferredCommitConnection):
+                yield
+                return
+            
+            self._local.connection = _DeferredCommitConnection(conn)
+            try:
+                yield
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                self._local.connection = conn
+    
     def close(self):
         """Close the database connection."""
         if hasattr(self._local, 'connection') and self._local.connection:
@@ -332,6 +387,8 @@ class DatabaseManager:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_addresses_digipin ON addresses(digipin)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_validations_status ON validations(status)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_validations_agent ON validations(assigned_agent_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_validations_address ON validations(address_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_validations_filters ON validations(status, validation_type, priority)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_deliveries_address ON deliveries(address_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_verifications_validation ON verifications(validation_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)")
@@ -463,35 +520,60 @@ class DatabaseManager:
     # VALIDATION OPERATIONS
     # -------------------------------------------------------------------------
     
+    _VALIDATION_INSERT = """
+        INSERT INTO validations (
+            id, address_id, digital_address, digipin, descriptive_address,
+            validation_type, status, priority, requester_id,
+            assigned_agent_id, consent_id, notes
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    def _validation_row(self, data: Dict) -> tuple:
+        """Build INSERT parameters for a validation (ID first)."""
+        return (
+            data.get('id') or self._generate_id("VAL"),
+            data.get('address_id'),
+            data.get('digital_address'),
+            data.get('digipin'),
+            data.get('descriptive_address'),
+            data.get('validation_type', 'DIGITAL'),
+            data.get('status', 'PENDING'),
+            data.get('priority', 'NORMAL'),
+            data.get('requester_id'),
+            data.get('assigned_agent_id'),
+            data.get('consent_id'),
+            data.get('notes')
+        )
+    
     def create_validation(self, data: Dict) -> str:
         """Create a new validation request."""
-        validation_id = data.get('id') or self._generate_id("VAL")
+        row = self._validation_row(data)
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO validations (
-                    id, address_id, digital_address, digipin, descriptive_address,
-                    validation_type, status, priority, requester_id,
-                    assigned_agent_id, consent_id, notes
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                validation_id,
-                data.get('address_id'),
-                data.get('digital_address'),
-                data.get('digipin'),
-                data.get('descriptive_address'),
-                data.get('validation_type', 'DIGITAL'),
-                data.get('status', 'PENDING'),
-                data.get('priority', 'NORMAL'),
-                data.get('requester_id'),
-                data.get('assigned_agent_id'),
-                data.get('consent_id'),
-                data.get('notes')
-            ))
+            cursor.execute(self._VALIDATION_INSERT, row)
             conn.commit()
         
-        return validation_id
+        return row[0]
+    
+    def bulk_create_validations(self, records: List[Dict]) -> List[str]:
+        """
+        Create many validation requests with a single executemany and commit.
+        
+        Args:
+            records: Validation dicts, same keys as create_validation
+            
+        Returns:
+            Created validation IDs, in input order
+        """
+        rows = [self._validation_row(data) for data in records]
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(self._VALIDATION_INSERT, rows)
+            conn.commit()
+        
+        return [row[0] for row in rows]
     
     def get_validation(self, validation_id: str) -> Optional[Dict]:
         """Get validation by ID."""
@@ -516,6 +598,37 @@ class DatabaseManager:
             conn.commit()
             return cursor.rowcount > 0
     
+    def update_validations_bulk(self, validation_ids: List[str], data: Dict) -> int:
+        """
+        Apply the same field updates to several validations in one UPDATE.
+        
+        Args:
+            validation_ids: Validation IDs to update
+            data: Column values to set, as for update_validation
+            
+        Returns:
+            Number of validations updated
+        """
+        if not validation_ids:
+            return 0
+        
+        data = {**data, 'updated_at': datetime.now().isoformat()}
+        set_clause = ", ".join([f"{k} = ?" for k in data.keys()])
+        placeholders = ", ".join("?" * len(validation_ids))
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"UPDATE validations SET {set_clause} WHERE id IN ({placeholders})",
+                list(data.values()) + list(validation_ids)
+            )
+            conn.commit()
+            return cursor.rowcount
+    
+    def bulk_update_validation_status(self, validation_ids: List[str], status: str) -> int:
+        """Set the status of several validations in one UPDATE."""
+        return self.update_validations_bulk(validation_ids, {'status': status})
+    
     def get_validations_by_status(self, status: str) -> List[Dict]:
         """Get all validations with a specific status."""
         with self.get_connection() as conn:
@@ -557,13 +670,41 @@ class DatabaseManager:
             )
             return [self._row_to_dict(row) for row in cursor.fetchall()]
     
-    def get_all_validations(self, limit: int = 100, offset: int = 0) -> List[Dict]:
-        """Get all validations with pagination."""
+    def get_all_validations(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        status: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        priority: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Get validations with pagination and optional filters.
+        
+        Args:
+            limit: Maximum number of rows
+            offset: Rows to skip
+            status: Only validations with this status
+            validation_type: Only validations of this type
+            priority: Only validations with this priority
+            
+        Returns:
+            Matching validations, newest first
+        """
+        filters = {
+            'status': status,
+            'validation_type': validation_type,
+            'priority': priority
+        }
+        clauses = [f"{column} = ?" for column, value in filters.items() if value is not None]
+        params = [value for value in filters.values() if value is not None]
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT * FROM validations ORDER BY created_at DESC LIMIT ? OFFSET ?",
-                (limit, offset)
+                f"SELECT * FROM validations {where}ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
             )
             return [self._row_to_dict(row) for row in cursor.fetchall()]
     
@@ -611,6 +752,29 @@ class DatabaseManager:
     # AGENT OPERATIONS
     # -------------------------------------------------------------------------
     
+    _AGENT_INSERT = """
+        INSERT INTO agents (
+            id, name, email, phone, password, photo_url,
+            certification_date, certification_expiry, active,
+            performance_score
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    def _agent_row(self, data: Dict) -> tuple:
+        """Build INSERT parameters for an agent (ID first)."""
+        return (
+            data.get('id') or self._generate_id("AGT"),
+            data.get('name'),
+            data.get('email'),
+            data.get('phone'),
+            data.get('password'),
+            data.get('photo_url'),
+            data.get('certification_date'),
+            data.get('certification_expiry'),
+            data.get('active', 1),
+            data.get('performance_score', 0.8)
+        )
+    
     def create_agent(self, data: Dict) -> str:
         """Create a new agent."""
         agent_id = data.get('id') or self._generate_id("AGT")
@@ -638,24 +802,7 @@ class DatabaseManager:
             if cursor.fetchone():
                 raise ValueError(f"Agent ID '{agent_id}' already exists")
             
-            cursor.execute("""
-                INSERT INTO agents (
-                    id, name, email, phone, password, photo_url,
-                    certification_date, certification_expiry, active,
-                    performance_score
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                agent_id,
-                data.get('name'),
-                email,
-                phone,
-                data.get('password'),
-                data.get('photo_url'),
-                data.get('certification_date'),
-                data.get('certification_expiry'),
-                data.get('active', 1),
-                data.get('performance_score', 0.8)
-            ))
+            cursor.execute(self._AGENT_INSERT, self._agent_row({**data, 'id': agent_id}))
             conn.commit()
         
         return agent_id
@@ -674,6 +821,50 @@ class DatabaseManager:
             cursor.execute("SELECT * FROM agents WHERE email = ?", (email,))
             return self._row_to_dict(cursor.fetchone())
     
+    def bulk_create_agents(self, records: List[Dict]) -> List[str]:
+        """
+        Create many agents with a single executemany and commit.
+        
+        Unlike create_agent, duplicates are not pre-checked one by one; the
+        UNIQUE email/phone constraints reject them with sqlite3.IntegrityError.
+        
+        Args:
+            records: Agent dicts, same keys as create_agent
+            
+        Returns:
+            Created agent IDs, in input order
+        """
+        rows = [self._agent_row(data) for data in records]
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(self._AGENT_INSERT, rows)
+            conn.commit()
+        
+        return [row[0] for row in rows]
+    
+    def get_agents_by_emails(self, emails: List[str]) -> Dict[str, str]:
+        """
+        Look up agent IDs for several emails in one query.
+        
+        Args:
+            emails: Email addresses to look up
+            
+        Returns:
+            Dict mapping each registered email to its agent ID
+        """
+        if not emails:
+            return {}
+        
+        placeholders = ", ".join("?" * len(emails))
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT id, email FROM agents WHERE email IN ({placeholders})",
+                list(emails)
+            )
+            return {row['email']: row['id'] for row in cursor.fetchall()}
+    
     def delete_agent(self, agent_id: str) -> bool:
         """Delete an agent."""
         try:
@@ -723,6 +914,26 @@ class DatabaseManager:
                 cursor.execute("SELECT * FROM agents ORDER BY name")
             return [self._row_to_dict(row) for row in cursor.fetchall()]
     
+    def get_top_agent_performance(self, limit: int = 50) -> List[Tuple[str, float]]:
+        """
+        Get (name, performance score) pairs for the best-performing agents.
+        
+        Args:
+            limit: Maximum number of agents to return
+            
+        Returns:
+            List of (name, performance_score) tuples, highest score first
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT name, COALESCE(performance_score, 0) as performance_score
+                FROM agents
+                ORDER BY performance_score DESC
+                LIMIT ?
+            """, (limit,))
+            return [(row['name'], row['performance_score']) for row in cursor.fetchall()]
+    
     def get_agent_stats(self, agent_id: str) -> Dict:
         """Get agent performance statistics."""
         with self.get_connection() as conn:
@@ -953,6 +1164,11 @@ class DatabaseManager:
         if not expires_at:
             expires_at = (datetime.now() + timedelta(days=30)).isoformat()
         
+        # scope may be a list of grants; the column stores it as JSON text
+        scope = data.get('scope', 'view')
+        if isinstance(scope, (list, tuple)):
+            scope = json.dumps(list(scope))
+        
         consent_artifact = json.dumps({
             'consent_id': consent_id,
             'user_id': data.get('user_id'),
@@ -979,7 +1195,7 @@ class DatabaseManager:
                 data.get('grantee_name'),
                 data.get('grantee_type', 'AIU'),
                 data.get('purpose'),
-                data.get('scope', 'view'),
+                scope,
                 access_token,
                 consent_artifact,
                 expires_at
@@ -1071,32 +1287,57 @@ class DatabaseManager:
     # DELIVERY OPERATIONS
     # -------------------------------------------------------------------------
     
+    _DELIVERY_INSERT = """
+        INSERT INTO deliveries (
+            id, address_id, status, actual_latitude, actual_longitude,
+            distance_from_stated, ease_rating, delivery_partner, notes, timestamp
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    def _delivery_row(self, data: Dict) -> tuple:
+        """Build INSERT parameters for a delivery (ID first)."""
+        return (
+            data.get('id') or self._generate_id("DEL"),
+            data.get('address_id'),
+            data.get('status', 'PENDING'),
+            data.get('actual_latitude'),
+            data.get('actual_longitude'),
+            data.get('distance_from_stated'),
+            data.get('ease_rating'),
+            data.get('delivery_partner'),
+            data.get('notes'),
+            data.get('timestamp', datetime.now().isoformat())
+        )
+    
     def create_delivery(self, data: Dict) -> str:
         """Create a new delivery record."""
-        delivery_id = data.get('id') or self._generate_id("DEL")
+        row = self._delivery_row(data)
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO deliveries (
-                    id, address_id, status, actual_latitude, actual_longitude,
-                    distance_from_stated, ease_rating, delivery_partner, notes, timestamp
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                delivery_id,
-                data.get('address_id'),
-                data.get('status', 'PENDING'),
-                data.get('actual_latitude'),
-                data.get('actual_longitude'),
-                data.get('distance_from_stated'),
-                data.get('ease_rating'),
-                data.get('delivery_partner'),
-                data.get('notes'),
-                data.get('timestamp', datetime.now().isoformat())
-            ))
+            cursor.execute(self._DELIVERY_INSERT, row)
             conn.commit()
         
-        return delivery_id
+        return row[0]
+    
+    def bulk_create_deliveries(self, records: List[Dict]) -> List[str]:
+        """
+        Create many delivery records with a single executemany and commit.
+        
+        Args:
+            records: Delivery dicts, same keys as create_delivery
+            
+        Returns:
+            Created delivery IDs, in input order
+        """
+        rows = [self._delivery_row(data) for data in records]
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(self._DELIVERY_INSERT, rows)
+            conn.commit()
+        
+        return [row[0] for row in rows]
     
     def get_deliveries_by_address(self, address_id: str) -> List[Dict]:
         """Get all deliveries for an address."""
@@ -1142,41 +1383,66 @@ class DatabaseManager:
     # VERIFICATION OPERATIONS
     # -------------------------------------------------------------------------
     
-    def create_verification(self, data: Dict) -> str:
-        """Create a new verification record."""
-        verification_id = data.get('id') or self._generate_id("VER")
-        
+    _VERIFICATION_INSERT = """
+        INSERT INTO verifications (
+            id, validation_id, agent_id, verified, quality_score,
+            evidence_type, photos, gps_latitude, gps_longitude,
+            gps_accuracy, signature_data, notes, timestamp
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    def _verification_row(self, data: Dict) -> tuple:
+        """Build INSERT parameters for a verification (ID first)."""
         # Convert photos list to JSON if needed
         photos = data.get('photos')
         if isinstance(photos, list):
             photos = json.dumps(photos)
         
+        return (
+            data.get('id') or self._generate_id("VER"),
+            data.get('validation_id'),
+            data.get('agent_id'),
+            data.get('verified', 0),
+            data.get('quality_score'),
+            data.get('evidence_type'),
+            photos,
+            data.get('gps_latitude'),
+            data.get('gps_longitude'),
+            data.get('gps_accuracy'),
+            data.get('signature_data'),
+            data.get('notes'),
+            data.get('timestamp', datetime.now().isoformat())
+        )
+    
+    def create_verification(self, data: Dict) -> str:
+        """Create a new verification record."""
+        row = self._verification_row(data)
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO verifications (
-                    id, validation_id, agent_id, verified, quality_score,
-                    evidence_type, photos, gps_latitude, gps_longitude,
-                    gps_accuracy, signature_data, notes, timestamp
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                verification_id,
-                data.get('validation_id'),
-                data.get('agent_id'),
-                data.get('verified', 0),
-                data.get('quality_score'),
-                data.get('evidence_type'),
-                photos,
-                data.get('gps_latitude'),
-                data.get('gps_longitude'),
-                data.get('gps_accuracy'),
-                data.get('signature_data'),
-                data.get('notes'),
-                data.get('timestamp', datetime.now().isoformat())
-            ))
+            cursor.execute(self._VERIFICATION_INSERT, row)
+            conn.commit()
+        
+        return row[0]
+    
+    def bulk_create_verifications(self, records: List[Dict]) -> List[str]:
+        """
+        Create many verification records with a single executemany and commit.
+        
+        Args:
+            records: Verification dicts, same keys as create_verification
+            
+        Returns:
+            Created verification IDs, in input order
+        """
+        rows = [self._verification_row(data) for data in records]
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(self._VERIFICATION_INSERT, rows)
             conn.commit()
         
-        return verification_id
+        return [row[0] for row in rows]
     
     def get_verifications_by_validation(self, validation_id: str) -> List[Dict]:
         """Get all verifications for a validation."""
@@ -1198,6 +1464,38 @@ class DatabaseManager:
                 results.append(d)
             return results
     
+    def get_verifications_by_validation_ids(self, validation_ids: List[str]) -> Dict[str, List[Dict]]:
+        """
+        Get verifications for several validations in a single query.
+        
+        Args:
+            validation_ids: Validation IDs to fetch verifications for
+            
+        Returns:
+            Dict mapping each validation ID to its verifications (newest first)
+        """
+        grouped = {vid: [] for vid in validation_ids}
+        if not validation_ids:
+            return grouped
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            placeholders = ", ".join("?" * len(validation_ids))
+            cursor.execute(
+                f"SELECT * FROM verifications WHERE validation_id IN ({placeholders}) ORDER BY timestamp DESC",
+                list(validation_ids)
+            )
+            for row in cursor.fetchall():
+                d = self._row_to_dict(row)
+                # Parse photos JSON
+                if d.get('photos'):
+                    try:
+                        d['photos'] = json.loads(d['photos'])
+                    except:
+                        pass
+                grouped.setdefault(d['validation_id'], []).append(d)
+            return grouped
+    
     def get_verifications_by_agent(self, agent_id: str, limit: int = 50) -> List[Dict]:
         """Get verifications by agent."""
         with self.get_connection() as conn:
@@ -34,6 +34,7 @@ Encoding Process:
 """
 
 import math
+from functools import lru_cache
 from typing import Tuple, Optional, List, Dict, Any
 from dataclasses import dataclass
 
@@ -527,10 +528,7 @@ class DIGIPINValidator:
     
     def _format_digipin(self, digipin: str) -> str:
         """Format DIGIPIN with hyphens: XXX-XXX-XXXX."""
-        clean = self._clean_digipin(digipin)
-        if len(clean) != 10:
-            return clean
-        return f"{clean[0:3]}-{clean[3:6]}-{clean[6:10]}"
+        return format_digipin(digipin)
     
     def _is_within_bounds(self, latitude: float, longitude: float) -> bool:
         """Check if coordinates are within India bounds."""
@@ -631,6 +629,22 @@ def decode_digipin(digipin: str) -> Tuple[float, float]:
     result = _validator.decode(digipin)
     return (result.center_lat, result.center_lon) if result.valid else (0, 0)
 
+@lru_cache(maxsize=4096)
+def format_digipin(digipin: str) -> str:
+    """
+    Format DIGIPIN with hyphens: XXX-XXX-XXXX (memoized).
+    
+    Args:
+        digipin: DIGIPIN string, with or without hyphens
+        
+    Returns:
+        Formatted DIGIPIN, or the cleaned input if it is not 10 characters
+    """
+    clean = digipin.replace('-', '').replace(' ', '').strip().upper()
+    if len(clean) != 10:
+        return clean
+    return f"{clean[0:3]}-{clean[3:6]}-{clean[6:10]}"
+
 def validate_digipin(digipin: str) -> bool:
     """
     Validate DIGIPIN (convenience function).
@@ -16,8 +16,9 @@ Generates realistic sample data including:
 
 import random
 import json
+import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 import sys
 import os
 
@@ -25,7 +26,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.database import get_database, DatabaseManager
 from utils.digipin import DIGIPINValidator
-from utils.confidence_score import get_grade
+from utils.confidence_score import GRADE_BINS, GRADE_LABELS
 
 
 # =============================================================================
@@ -98,6 +99,22 @@ DELIVERY_PARTNERS = [
     "Shadowfax"
 ]
 
+# Delivery outcomes with their probabilities and GPS scatter (degrees)
+DELIVERY_OUTCOMES = ["DELIVERED", "DELIVERED_WITH_DIFFICULTY", "FAILED"]
+DELIVERY_OUTCOME_WEIGHTS = [0.75, 0.15, 0.10]
+DELIVERY_OFFSET_SIGMA = np.array([0.0003, 0.001, 0.002])
+
+# Sample account that owns the generated consent records
+SAMPLE_CONSENT_OWNER = {
+    'name': 'Sample Address Owner',
+    'email': 'sample.owner@aava.local',
+    'password': 'sample-owner',
+    'verified': 1
+}
+
+# Report row-level progress about this many times per stage
+PROGRESS_REPORTS = 10
+
 
 # =============================================================================
 # SAMPLE DATA GENERATOR CLASS
@@ -110,12 +127,16 @@ class SampleDataGenerator:
         """Initialize with database connection."""
         self.db = db or get_database()
         self.validator = DIGIPINValidator()
+        self.rng = np.random.default_rng()
         
         # Generated IDs for reference
         self.address_ids = []
         self.agent_ids = []
         self.validation_ids = []
         
+        # Address rows by ID, so later stages don't re-query them
+        self.addresses: Dict[str, Dict] = {}
+        
     def generate_phone(self) -> str:
         """Generate a random Indian phone number."""
         prefixes = ["98", "97", "96", "95", "94", "93", "91", "90", "89", "88", "87", "86"]
@@ -137,6 +158,12 @@ class SampleDataGenerator:
         city_code = city.lower().replace(" ", "")[:6]
         return f"{random.choice(prefixes)}{index}@{city_code}.address.in"
     
+    def get_address(self, address_id: str) -> Optional[Dict]:
+        """Get an address row, fetching it from the database only once."""
+        if address_id not in self.addresses:
+            self.addresses[address_id] = self.db.get_address(address_id)
+        return self.addresses[address_id]
+    
     # -------------------------------------------------------------------------
     # AGENT GENERATION
     # -------------------------------------------------------------------------
@@ -145,18 +172,18 @@ class SampleDataGenerator:
         """Generate sample agents."""
         print(f"\n👤 Generating {count} agents...")
         
-        agent_ids = []
+        names = AGENT_NAMES[:count]
+        emails = [f"{first.lower()}.{last.lower()}@aava.in" for first, last in names]
         
-        for i in range(min(count, len(AGENT_NAMES))):
-            first, last = AGENT_NAMES[i]
+        # Check which agents already exist in one query
+        existing = self.db.get_agents_by_emails(emails)
+        
+        records = []
+        for (first, last), email in zip(names, emails):
             name = f"{first} {last}"
-            email = f"{first.lower()}.{last.lower()}@aava.in"
             
-            # Check if already exists
-            existing = self.db.get_agent_by_email(email)
-            if existing:
+            if email in existing:
                 print(f"  ⚠ Agent {name} already exists, skipping...")
-                agent_ids.append(existing['id'])
                 continue
             
             # Random certification dates
@@ -168,7 +195,7 @@ class SampleDataGenerator:
             base_perf = 0.7 + (days_active / 1000) * 0.2
             performance = min(0.98, base_perf + random.gauss(0, 0.05))
             
-            agent_id = self.db.create_agent({
+            records.append({
                 'name': name,
                 'email': email,
                 'phone': self.generate_phone(),
@@ -177,9 +204,16 @@ class SampleDataGenerator:
                 'active': 1 if random.random() > 0.1 else 0,
                 'performance_score': round(performance, 3)
             })
-            
-            agent_ids.append(agent_id)
-            print(f"  ✓ Created agent: {name} ({agent_id})")
+        
+        # Insert new agents together, then list all IDs in name order
+        created = dict(zip(
+            (r['email'] for r in records),
+            self.db.bulk_create_agents(records)
+        ))
+        for record in records:
+            print(f"  ✓ Created agent: {record['name']} ({created[record['email']]})")
+        
+        agent_ids = [existing.get(email) or created[email] for email in emails]
         
         self.agent_ids = agent_ids
         return agent_ids
@@ -195,14 +229,21 @@ class SampleDataGenerator:
         address_ids = []
         cities = list(INDIAN_CITIES.keys())
         
+        # Draw offsets, pincode variation and confidence for every address at once
+        offsets = self.rng.normal(0, 0.02, (count, 2))  # Within ~5km
+        pincode_offsets = self.rng.integers(0, 100, count)
+        confidences = np.clip(self.rng.normal(70, 15, count), 0, 100)  # Around 70
+        grades = np.array(GRADE_LABELS)[np.digitize(confidences, GRADE_BINS)]
+        
+        report_step = max(1, count // PROGRESS_REPORTS)
+        
         for i in range(count):
             # Distribute across cities
             city = cities[i % len(cities)]
             base_lat, base_lon, state, base_pincode = INDIAN_CITIES[city]
             
-            # Add random offset (within ~5km)
-            lat = base_lat + random.gauss(0, 0.02)
-            lon = base_lon + random.gauss(0, 0.02)
+            lat = base_lat + float(offsets[i, 0])
+            lon = base_lon + float(offsets[i, 1])
             
             # Generate DIGIPIN
             result = self.validator.encode(lat, lon)
@@ -213,14 +254,13 @@ class SampleDataGenerator:
             street_addr = self.generate_street_address(city)
             
             # Vary pincode slightly
-            pincode_num = int(base_pincode) + random.randint(0, 99)
+            pincode_num = int(base_pincode) + int(pincode_offsets[i])
             pincode = str(pincode_num).zfill(6)
             
-            # Generate confidence score (normal distribution around 70)
-            confidence = max(0, min(100, random.gauss(70, 15)))
-            grade = get_grade(confidence)
+            confidence = float(confidences[i])
+            grade = str(grades[i])
             
-            address_id = self.db.create_address({
+            address = {
                 'digital_address': digital_addr,
                 'digipin': digipin,
                 'descriptive_address': street_addr,
@@ -231,12 +271,14 @@ class SampleDataGenerator:
                 'pincode': pincode,
                 'confidence_score': round(confidence, 2),
                 'confidence_grade': grade
-            })
+            }
+            address_id = self.db.create_address(address)
+            self.addresses[address_id] = {**address, 'id': address_id}
             
             address_ids.append(address_id)
             
-            if (i + 1) % 10 == 0:
-                print(f"  ✓ Created {i + 1} addresses...")
+            if (i + 1) % report_step == 0:
+                print(f"  ✓ Created {i + 1} addresses ({(i + 1) / count:.0%})...")
         
         self.address_ids = address_ids
         print(f"  ✓ Total: {len(address_ids)} addresses created")
@@ -254,54 +296,54 @@ class SampleDataGenerator:
             print("  ⚠ No addresses found. Generate addresses first.")
             return 0
         
-        total = 0
+        # Addresses to generate for, with their stated coordinates
+        addresses = [a for a in map(self.get_address, self.address_ids) if a]
+        if not addresses:
+            return 0
         
-        for addr_id in self.address_ids:
-            # Get address for reference
-            addr = self.db.get_address(addr_id)
-            if not addr:
-                continue
-            
-            # Variable number of deliveries
-            num_deliveries = per_address + random.randint(-5, 5)
-            num_deliveries = max(3, num_deliveries)
-            
-            for j in range(num_deliveries):
-                # Determine delivery outcome
-                roll = random.random()
-                if roll < 0.75:
-                    status = "DELIVERED"
-                    ease_rating = random.randint(3, 5)
-                    offset = random.gauss(0, 0.0003)
-                elif roll < 0.90:
-                    status = "DELIVERED_WITH_DIFFICULTY"
-                    ease_rating = random.randint(1, 3)
-                    offset = random.gauss(0, 0.001)
-                else:
-                    status = "FAILED"
-                    ease_rating = None
-                    offset = random.gauss(0, 0.002)
-                
-                # Random timestamp in past 180 days
-                days_ago = random.randint(1, 180)
-                timestamp = datetime.now() - timedelta(
-                    days=days_ago,
-                    hours=random.randint(8, 20),
-                    minutes=random.randint(0, 59)
-                )
-                
-                self.db.create_delivery({
-                    'address_id': addr_id,
-                    'status': status,
-                    'actual_latitude': addr['latitude'] + offset,
-                    'actual_longitude': addr['longitude'] + offset,
-                    'distance_from_stated': abs(offset) * 111000,  # Approx meters
-                    'ease_rating': ease_rating,
-                    'delivery_partner': random.choice(DELIVERY_PARTNERS),
-                    'timestamp': timestamp.isoformat()
-                })
-                
-                total += 1
+        # Variable number of deliveries per address
+        counts = np.maximum(3, per_address + self.rng.integers(-5, 6, len(addresses)))
+        n = int(counts.sum())
+        
+        # Draw every random value for every delivery in one batch
+        # Outcome: 0 = DELIVERED, 1 = DELIVERED_WITH_DIFFICULTY, 2 = FAILED
+        outcome = self.rng.choice(3, n, p=DELIVERY_OUTCOME_WEIGHTS)
+        offsets = self.rng.normal(0, DELIVERY_OFFSET_SIGMA[outcome])
+        ease_ratings = np.where(
+            outcome == 0,
+            self.rng.integers(3, 6, n),
+            self.rng.integers(1, 4, n)
+        )
+        days_ago = self.rng.integers(1, 181, n)  # Past 180 days
+        hours = self.rng.integers(8, 21, n)
+        minutes = self.rng.integers(0, 60, n)
+        partners = self.rng.choice(DELIVERY_PARTNERS, n)
+        
+        address_index = np.repeat(np.arange(len(addresses)), counts)
+        latitudes = np.array([a['latitude'] for a in addresses])[address_index] + offsets
+        longitudes = np.array([a['longitude'] for a in addresses])[address_index] + offsets
+        
+        now = datetime.now()
+        records = [
+            {
+                'address_id': addresses[a]['id'],
+                'status': DELIVERY_OUTCOMES[o],
+                'actual_latitude': lat,
+                'actual_longitude': lon,
+                'distance_from_stated': abs(offset) * 111000,  # Approx meters
+                'ease_rating': ease if o != 2 else None,
+                'delivery_partner': partner,
+                'timestamp': (now - timedelta(days=d, hours=h, minutes=m)).isoformat()
+            }
+            for a, o, lat, lon, offset, ease, partner, d, h, m in zip(
+                address_index.tolist(), outcome.tolist(), latitudes.tolist(),
+                longitudes.tolist(), offsets.tolist(), ease_ratings.tolist(),
+                partners.tolist(), days_ago.tolist(), hours.tolist(), minutes.tolist()
+            )
+        ]
+        
+        # Insert every delivery in one transaction
+        total = len(self.db.bulk_create_deliveries(records))
         
         print(f"  ✓ Total: {total} delivery records created")
         return total
@@ -319,38 +361,36 @@ class SampleDataGenerator:
             print("  ⚠ No addresses found. Generate addresses first.")
             return []
         
-        validation_ids = []
+        records = []
         selected_addresses = random.sample(self.address_ids, num_validations)
         
-        for addr_id in selected_addresses:
-            addr = self.db.get_address(addr_id)
+        # Draw type, status and priority for every validation at once
+        val_types = self.rng.choice(
+            ["PHYSICAL", "DIGITAL", "HYBRID"],  # Weighted toward HYBRID
+            num_validations, p=[0.2, 0.3, 0.5]
+        )
+        statuses = self.rng.choice(
+            ["PENDING", "IN_PROGRESS", "COMPLETED", "FAILED"],  # Weighted toward completed
+            num_validations, p=[0.15, 0.1, 0.65, 0.1]
+        )
+        priorities = self.rng.choice(
+            ["LOW", "NORMAL", "HIGH", "URGENT"],
+            num_validations, p=[0.1, 0.5, 0.3, 0.1]
+        )
+        
+        for addr_id, val_type, status, priority in zip(
+            selected_addresses, val_types.tolist(), statuses.tolist(), priorities.tolist()
+        ):
+            addr = self.get_address(addr_id)
             if not addr:
                 continue
             
-            # Random validation type weighted toward HYBRID
-            val_type = random.choices(
-                ["PHYSICAL", "DIGITAL", "HYBRID"],
-                weights=[0.2, 0.3, 0.5]
-            )[0]
-            
-            # Random status weighted toward completed
-            status = random.choices(
-                ["PENDING", "IN_PROGRESS", "COMPLETED", "FAILED"],
-                weights=[0.15, 0.1, 0.65, 0.1]
-            )[0]
-            
-            # Priority distribution
-            priority = random.choices(
-                ["LOW", "NORMAL", "HIGH", "URGENT"],
-                weights=[0.1, 0.5, 0.3, 0.1]
-            )[0]
-            
             # Assign agent for non-pending
             agent_id = None
             if status != "PENDING" and self.agent_ids:
                 agent_id = random.choice(self.agent_ids)
             
-            validation_id = self.db.create_validation({
+            records.append({
                 'address_id': addr_id,
                 'digital_address': addr.get('digital_address'),
                 'digipin': addr.get('digipin'),
@@ -361,8 +401,9 @@ class SampleDataGenerator:
                 'assigned_agent_id': agent_id,
                 'notes': f"Auto-generated validation request for {addr.get('city', 'unknown city')}"
             })
-            
-            validation_ids.append(validation_id)
+        
+        # Insert every validation in one transaction
+        validation_ids = self.db.bulk_create_validations(records)
         
         self.validation_ids = validation_ids
         print(f"  ✓ Total: {len(validation_ids)} validations created")
@@ -380,7 +421,7 @@ class SampleDataGenerator:
             print("  ⚠ No validations found. Generate validations first.")
             return 0
         
-        total = 0
+        records = []
         
         for val_id in self.validation_ids:
             val = self.db.get_validation(val_id)
@@ -391,7 +432,7 @@ class SampleDataGenerator:
                 continue
             
             # Get address for GPS data
-            addr = self.db.get_address(val.get('address_id'))
+            addr = self.get_address(val.get('address_id'))
             if not addr:
                 continue
             
@@ -401,7 +442,7 @@ class SampleDataGenerator:
             
             evidence_types = ['photo', 'photo+signature', 'video', 'photo+video']
             
-            self.db.create_verification({
+            records.append({
                 'validation_id': val_id,
                 'agent_id': val.get('assigned_agent_id'),
                 'verified': verified,
@@ -413,8 +454,9 @@ class SampleDataGenerator:
                 'gps_accuracy': random.uniform(3, 15),
                 'notes': 'Physical verification completed successfully.' if verified else 'Address not found at location.'
             })
-            
-            total += 1
+        
+        # Insert every verification in one transaction
+        total = len(self.db.bulk_create_verifications(records))
         
         print(f"  ✓ Total: {total} verifications created")
         return total
@@ -430,6 +472,10 @@ class SampleDataGenerator:
         if not self.validation_ids:
             return 0
         
+        # Consents must belong to a user account; reuse one sample owner
+        owner = self.db.get_user_by_email(SAMPLE_CONSENT_OWNER['email'])
+        owner_id = owner['id'] if owner else self.db.create_user(SAMPLE_CONSENT_OWNER)
+        
         total = 0
         
         for val_id in self.validation_ids:
@@ -440,12 +486,12 @@ class SampleDataGenerator:
             # Random consent expiry
             expires = datetime.now() + timedelta(days=random.randint(30, 365))
             
-            consent_id = self.db.create_consent({
-                'subject_id': val.get('address_id'),
-                'granter': val.get('digital_address', 'unknown'),
-                'grantee': 'AAVA System',
+            consent_id, _ = self.db.create_consent({
+                'user_id': owner_id,
+                'address_id': val.get('address_id'),
+                'grantee_name': 'AAVA System',
+                'purpose': f"Address validation {val_id[:8]}",
                 'scope': ['validation', 'verification', 'delivery_history'],
-                'consent_artifact': f"CONSENT-{val_id[:8]}",
                 'expires_at': expires.isoformat()
             })
             
@@ -520,14 +566,15 @@ class SampleDataGenerator:
         
         start_time = datetime.now()
         
-        # Generate in order
-        agents = self.generate_agents(num_agents)
-        addresses = self.generate_addresses(num_addresses)
-        deliveries = self.generate_deliveries(deliveries_per_address)
-        validations = self.generate_validations(validation_percentage)
-        verifications = self.generate_verifications()
-        consents = self.generate_consents()
-        audit_logs = self.generate_audit_logs()
+        # Generate in order, committing everything once at the end
+        with self.db.transaction():
+            agents = self.generate_agents(num_agents)
+            addresses = self.generate_addresses(num_addresses)
+            deliveries = self.generate_deliveries(deliveries_per_address)
+            validations = self.generate_validations(validation_percentage)
+            verifications = self.generate_verifications()
+            consents = self.generate_consents()
+            audit_logs = self.generate_audit_logs()
         
         duration = (datetime.now() - start_time).total_seconds()
         